@@ -0,0 +1,104 @@
+"""
+Adaptive Concurrency Controller for [YOUR-DOMAIN] Content Audit
+AIMD (additive increase, multiplicative decrease) limit on in-flight requests.
+"""
+
+import math
+import threading
+from typing import Callable, Dict, List, Optional
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers (0.0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class AdaptiveConcurrency:
+    """
+    Adjusts the number of in-flight requests from observed latency and errors.
+
+    After every `window` completed fetches the window is evaluated:
+    - healthy (p95 <= target_p95 and error rate <= max_error_rate): limit += 1
+    - degraded: limit *= decrease_factor (a back-off event)
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        target_p95: float = 2.0,
+        max_error_rate: float = 0.05,
+        window: int = 50,
+        decrease_factor: float = 0.5,
+        log: Optional[Callable[[str], None]] = None
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = min(max(initial, self.min_limit), self.max_limit)
+        self.target_p95 = target_p95
+        self.max_error_rate = max_error_rate
+        self.window = window
+        self.decrease_factor = decrease_factor
+        self.log = log or print
+
+        self.backoff_events: List[Dict] = []
+        self._latencies: List[float] = []
+        self._errors = 0
+        self._all_latencies: List[float] = []
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, error: bool) -> None:
+        """Record one completed fetch; adjusts the limit when a window is full."""
+        with self._lock:
+            self._latencies.append(latency)
+            self._all_latencies.append(latency)
+            if error:
+                self._errors += 1
+            if len(self._latencies) >= self.window:
+                self._adjust()
+
+    def _adjust(self) -> None:
+        """Apply AIMD to the finished window (caller holds the lock)."""
+        p50 = percentile(self._latencies, 50)
+        p95 = percentile(self._latencies, 95)
+        error_rate = self._errors / len(self._latencies)
+        old_limit = self.limit
+
+        if p95 <= self.target_p95 and error_rate <= self.max_error_rate:
+            self.limit = min(self.max_limit, self.limit + 1)
+            if self.limit != old_limit:
+                self.log(f"Concurrency {old_limit} -> {self.limit} "
+                         f"(p50={p50:.2f}s, p95={p95:.2f}s, errors={error_rate:.0%})")
+        else:
+            self.limit = max(self.min_limit, int(self.limit * self.decrease_factor))
+            reason = (f"p95 {p95:.2f}s > {self.target_p95:.2f}s" if p95 > self.target_p95
+                      else f"error rate {error_rate:.0%} > {self.max_error_rate:.0%}")
+            self.backoff_events.append({
+                'from': old_limit,
+                'to': self.limit,
+                'p50': round(p50, 3),
+                'p95': round(p95, 3),
+                'error_rate': round(error_rate, 3),
+                'reason': reason
+            })
+            self.log(f"BACK-OFF: concurrency {old_limit} -> {self.limit} ({reason})")
+
+        self._latencies = []
+        self._errors = 0
+
+    def get_stats(self) -> Dict:
+        """Return the current limit, overall latency percentiles and back-off count."""
+        with self._lock:
+            return {
+                'limit': self.limit,
+                'p50': percentile(self._all_latencies, 50),
+                'p95': percentile(self._all_latencies, 95),
+                'p99': percentile(self._all_latencies, 99),
+                'samples': len(self._all_latencies),
+                'backoffs': len(self.backoff_events)
+            }
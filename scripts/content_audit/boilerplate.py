@@ -0,0 +1,161 @@
+"""
+Boilerplate Model for [YOUR-DOMAIN] Content Audit
+Learns which DOM blocks repeat across the pages of a site and drops them from extraction.
+
+A block is an element near the top of <body>, identified by its DOM path
+(tag, id and classes of it and its ancestors) and a hash of its text. A header,
+footer, menu or filter panel has the same path and text on most pages of a
+template, while the main content has the same path but different text. Blocks
+seen on at least `MIN_SHARE` of the pages of a template (URL section), or of
+the whole site, are boilerplate.
+
+Dropping boilerplate first narrows the content search, and lets pages of
+themes the content selectors do not know fall back to the rest of <body>.
+The model is saved between runs, so a new run starts with what earlier runs
+learned.
+"""
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+SITE = '*'  # Key of the site-wide counts
+
+
+def block_step(tag: str, element_id: Optional[str], classes: Iterable[str]) -> str:
+    """One DOM path step: tag#id.class1.class2"""
+    step = tag
+    if element_id:
+        step += '#' + element_id
+    for name in classes:
+        step += '.' + name
+    return step
+
+
+def text_hash(text: str) -> str:
+    """Short fingerprint of a block's text."""
+    return hashlib.md5(text.encode('utf-8')).hexdigest()[:12]
+
+
+class BoilerplateModel:
+    """Per-template counts of repeated DOM blocks; thread-safe."""
+
+    MAX_DEPTH = 6  # Blocks are elements up to this many levels below <body>
+    MIN_PAGES = 10  # Pages a template (or the site) needs before its boilerplate is trusted
+    MIN_SHARE = 0.5  # A block on at least this share of pages is boilerplate
+    LEARN_PAGES = 100  # Templates stop learning after this many pages
+    PRUNE_EVERY = 50  # Pages between dropping blocks too rare to ever reach MIN_SHARE
+    PRUNE_SHARE = 0.1
+
+    def __init__(self):
+        self.pages: Dict[str, int] = {}
+        self.counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self._boilerplate: Dict[str, Dict[str, Set[str]]] = {}  # key -> path -> text hashes (cache)
+
+    def learning(self, template: str) -> bool:
+        """True while pages of this template should report their blocks."""
+        return self.pages.get(template, 0) < self.LEARN_PAGES
+
+    def is_trained(self, template: str) -> bool:
+        """True once the template or the whole site has been seen on enough pages."""
+        return self.pages.get(template, 0) >= self.MIN_PAGES or self.pages.get(SITE, 0) >= self.MIN_PAGES
+
+    def observe(self, template: str, blocks: Iterable[str]) -> None:
+        """Count the blocks ('path|hash') of one page."""
+        blocks = set(blocks)
+        with self._lock:
+            for key in (template, SITE):
+                pages = self.pages[key] = self.pages.get(key, 0) + 1
+                counts = self.counts.setdefault(key, {})
+                for block in blocks:
+                    counts[block] = counts.get(block, 0) + 1
+                if pages % self.PRUNE_EVERY == 0:
+                    floor = max(2, pages * self.PRUNE_SHARE)
+                    self.counts[key] = {b: n for b, n in counts.items() if n >= floor}
+                self._boilerplate.pop(key, None)
+
+    def _boilerplate_of(self, key: str) -> Dict[str, Set[str]]:
+        """path -> text hashes of the boilerplate blocks of one key (empty until trained)."""
+        with self._lock:
+            cached = self._boilerplate.get(key)
+            if cached is None:
+                cached = {}
+                pages = self.pages.get(key, 0)
+                if pages >= self.MIN_PAGES:
+                    for block, count in self.counts.get(key, {}).items():
+                        if count >= pages * self.MIN_SHARE:
+                            path, _, digest = block.rpartition('|')
+                            cached.setdefault(path, set()).add(digest)
+                self._boilerplate[key] = cached
+            return cached
+
+    def scan(self, template: str, blocks: Iterable[Tuple[object, int, str]],
+             text_of: Callable[[object], str], protected: Callable[[object], bool]) -> Tuple[List[str], List]:
+        """
+        Go over a page's blocks, given as (element, depth, path) in document order.
+
+        Returns the blocks to report while the template is learning, and the
+        outermost boilerplate elements to drop. Text is hashed only for
+        blocks that are reported or whose path is known boilerplate;
+        `protected` elements (content selector matches) are never dropped.
+        """
+        learning = self.learning(template)
+        known = [self._boilerplate_of(template), self._boilerplate_of(SITE)]
+        reported: List[str] = []
+        dropped = []
+        dropped_depth = None
+
+        for element, depth, path in blocks:
+            if dropped_depth is not None and depth > dropped_depth:
+                if not learning:
+                    continue  # Inside a dropped block
+            else:
+                dropped_depth = None
+            digests = [k[path] for k in known if path in k]
+            if not learning and not digests:
+                continue
+            text = text_of(element)
+            if not text:
+                continue
+            digest = text_hash(text)
+            if learning:
+                reported.append(f"{path}|{digest}")
+            if dropped_depth is None and any(digest in d for d in digests) and not protected(element):
+                dropped.append(element)
+                dropped_depth = depth
+        return reported, dropped
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {'pages': dict(self.pages), 'counts': {k: dict(v) for k, v in self.counts.items()}}
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> 'BoilerplateModel':
+        model = cls()
+        if data:
+            model.pages = dict(data.get('pages', {}))
+            model.counts = {k: dict(v) for k, v in data.get('counts', {}).items()}
+        return model
+
+    @classmethod
+    def load(cls, path: Path) -> 'BoilerplateModel':
+        """Load a saved model (an empty one if the file is missing)."""
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+
+    def summary(self) -> Dict[str, int]:
+        """Templates seen and boilerplate blocks known per template."""
+        return {key: sum(len(d) for d in self._boilerplate_of(key).values()) for key in list(self.pages)}
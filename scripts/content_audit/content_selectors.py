@@ -0,0 +1,124 @@
+"""
+Content Selector Engine for [YOUR-DOMAIN] Content Audit
+Finds the main content element of a page with precompiled selectors.
+
+The content selectors ('.class', '#id' or a tag name) are tried in priority
+order, and the first match with more than `min_chars` of text wins. Instead
+of one tree search per selector, all candidates are collected in a single
+traversal, and the text threshold stops reading a candidate as soon as it
+is met.
+
+Pages of one site share a few templates, so the engine remembers which
+selector won per template (URL section). On later pages of that template
+only the selectors up to the known winner are searched; the rest are
+searched only if none of those qualifies. The result is the same as trying
+every selector in order.
+"""
+
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from lxml import etree
+
+
+# Finds the first match of selectors[start:stop]: {selector index: element}
+FindCandidates = Callable[[int, int], Dict[int, object]]
+
+
+def has_text(strings: Iterable[str], min_chars: int, separator: str = ' ') -> bool:
+    """True if the stripped strings joined by `separator` are longer than `min_chars` (stops early)."""
+    length = -len(separator)
+    for string in strings:
+        length += len(separator) + len(string)
+        if length > min_chars:
+            return True
+    return False
+
+
+class SelectorEngine:
+    """Precompiled content selectors with a memo of the winning selector per template."""
+
+    def __init__(self, selectors: List[str], min_chars: int = 100):
+        self.selectors = list(selectors)
+        self.min_chars = min_chars
+        self.classes: Dict[str, int] = {}
+        self.ids: Dict[str, int] = {}
+        self.tags: Dict[str, int] = {}
+        for index, selector in enumerate(self.selectors):
+            if selector.startswith('.'):
+                self.classes.setdefault(selector[1:], index)
+            elif selector.startswith('#'):
+                self.ids.setdefault(selector[1:], index)
+            else:
+                self.tags.setdefault(selector, index)
+
+        self.winners: Dict[str, int] = {}  # Template key -> index of the selector that won
+        self.hits = 0  # Pages whose content was found with the memoized winner
+        self._xpaths: Dict[Tuple[int, int], etree.XPath] = {}
+        self._lock = threading.Lock()
+
+    def matches(self, tag: str, element_id: Optional[str], classes: Iterable[str],
+                start: int = 0, stop: Optional[int] = None) -> List[int]:
+        """Indexes of the selectors in selectors[start:stop] that an element matches."""
+        stop = len(self.selectors) if stop is None else stop
+        found = []
+        index = self.tags.get(tag)
+        if index is not None:
+            found.append(index)
+        index = self.ids.get(element_id) if element_id else None
+        if index is not None:
+            found.append(index)
+        for name in classes:
+            index = self.classes.get(name)
+            if index is not None:
+                found.append(index)
+        return [index for index in found if start <= index < stop]
+
+    def xpath(self, start: int, stop: int) -> etree.XPath:
+        """
+        Compiled XPath pre-filter for selectors[start:stop] on an lxml tree.
+        Class tests are substring matches; callers check exact class tokens
+        with matches().
+        """
+        key = (start, stop)
+        compiled = self._xpaths.get(key)
+        if compiled is None:
+            tests = []
+            for selector in self.selectors[start:stop]:
+                if selector.startswith('.'):
+                    tests.append(f"contains(@class, '{selector[1:]}')")
+                elif selector.startswith('#'):
+                    tests.append(f"@id = '{selector[1:]}'")
+                else:
+                    tests.append(f"self::{selector}")
+            compiled = etree.XPath(f"//*[{' or '.join(tests) or 'false()'}]")
+            with self._lock:
+                self._xpaths[key] = compiled
+        return compiled
+
+    def find_main_content(self, find: FindCandidates, qualifies: Callable[[object], bool],
+                          template: Optional[str] = None) -> Optional[object]:
+        """
+        Return the element of the first selector, in priority order, whose
+        first match qualifies; None if there is none.
+
+        With a known winner for `template`, selectors after it are searched
+        only when no selector up to it qualifies.
+        """
+        total = len(self.selectors)
+        winner = self.winners.get(template) if template else None
+        bounds = [(0, total)] if winner is None else [(0, winner + 1), (winner + 1, total)]
+
+        for start, stop in bounds:
+            if start >= stop:
+                continue
+            candidates = find(start, stop)
+            for index in sorted(candidates):
+                if qualifies(candidates[index]):
+                    if template:
+                        with self._lock:
+                            if index == winner:
+                                self.hits += 1
+                            self.winners[template] = index
+                    return candidates[index]
+        return None
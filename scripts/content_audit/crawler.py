@@ -0,0 +1,289 @@
+"""
+Crawl Engine for [YOUR-DOMAIN] Content Audit
+Fetches pages concurrently and yields results as they complete.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlparse
+
+try:
+    from .page_scraper import PageScraper, PageData
+    from .politeness import PolitenessScheduler
+    from .adaptive_concurrency import AdaptiveConcurrency, percentile
+    from .retry import RetryPolicy, CircuitBreaker
+except ImportError:
+    from page_scraper import PageScraper, PageData
+    from politeness import PolitenessScheduler
+    from adaptive_concurrency import AdaptiveConcurrency, percentile
+    from retry import RetryPolicy, CircuitBreaker
+
+
+class HostSlots:
+    """
+    Limit on in-flight requests to one host whose capacity may change while
+    requests are running. Shrinking never interrupts a request; new ones wait
+    until enough running ones finish.
+    """
+
+    def __init__(self, capacity: Callable[[], int]):
+        self.capacity = capacity
+        self.active = 0
+        self._cond = threading.Condition()
+
+    def __enter__(self) -> 'HostSlots':
+        with self._cond:
+            while self.active >= self.capacity():
+                self._cond.wait()
+            self.active += 1
+        return self
+
+    def __exit__(self, *exc) -> None:
+        with self._cond:
+            self.active -= 1
+            # The capacity may have grown meanwhile, so wake every waiter
+            self._cond.notify_all()
+
+
+class CrawlEngine:
+    """
+    Concurrent crawler built on top of PageScraper.
+
+    The audit is bound by network round-trips, so pages are fetched from a
+    thread pool while the number of in-flight requests per host is capped.
+    Results are yielded in completion order, not submission order.
+
+    If a PolitenessScheduler is given, robots.txt Disallow rules are applied
+    before fetching and every request waits for its host's turn.
+
+    If an AdaptiveConcurrency controller is given, it replaces the fixed
+    `concurrency` limit and is fed the latency of every fetch. Its current
+    limit also caps each host's slots, so it never exceeds `per_host_limit`
+    in effect; the controller's max_limit should be clamped to it.
+
+    Transient failures (timeouts, 429, 5xx) are retried according to the
+    RetryPolicy; an optional CircuitBreaker pauses hosts that keep failing.
+
+    With `parse=False` pages are yielded with their raw body unparsed, to be
+    handed to a ParsePipeline.
+    """
+
+    def __init__(
+        self,
+        scraper: PageScraper,
+        concurrency: int = 8,
+        per_host_limit: int = 4,
+        scheduler: Optional[PolitenessScheduler] = None,
+        controller: Optional[AdaptiveConcurrency] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        parse: bool = True
+    ):
+        self.scraper = scraper
+        self.concurrency = max(1, concurrency)
+        self.per_host_limit = max(1, per_host_limit)
+        self.scheduler = scheduler
+        self.controller = controller
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breaker = breaker
+        self.parse = parse  # False: return raw bodies for a separate parse stage
+        self.stats = {'retries': 0, 'deadline_reached': False}
+        self._host_slots: Dict[str, HostSlots] = {}
+        self._queue_waits: List[float] = []  # Seconds from submission to the first request
+        self._lock = threading.Lock()
+
+        # Let the shared session keep one pooled connection per worker
+        self.scraper.configure_pool(self.max_workers)
+
+    @property
+    def max_workers(self) -> int:
+        """Upper bound on in-flight requests (thread pool size)."""
+        return self.controller.max_limit if self.controller else self.concurrency
+
+    def _in_flight_limit(self) -> int:
+        """Current limit on in-flight requests."""
+        return self.controller.limit if self.controller else self.concurrency
+
+    def _host_limit(self) -> int:
+        """Current limit on in-flight requests per host."""
+        return min(self.per_host_limit, self._in_flight_limit())
+
+    def _host_slot(self, url: str) -> HostSlots:
+        """Return the slots limiting connections to the URL's host."""
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = HostSlots(self._host_limit)
+            return self._host_slots[host]
+
+    def queue_wait_stats(self) -> Dict:
+        """Percentiles of the time fetches waited for a host slot, the breaker and politeness."""
+        with self._lock:
+            waits = list(self._queue_waits)
+        return {'p50': percentile(waits, 50), 'p95': percentile(waits, 95), 'samples': len(waits)}
+
+    def _fetch(self, url: str, validators: Dict[str, Optional[str]],
+               deadline: Optional[float] = None) -> PageData:
+        """
+        Fetch a single page while holding a per-host slot, retrying transient failures.
+
+        Waits for the breaker, politeness and backoff end at `deadline`; the
+        page is then returned as a 'time_budget' error instead.
+        """
+        if self.scheduler and not self.scheduler.allowed(url):
+            return PageData(url=url, error="Disallowed by robots.txt", error_type='robots')
+
+        queued = time.monotonic()
+        with self._host_slot(url):
+            page_data = None
+            for attempt in range(1, self.retry_policy.max_attempts + 1):
+                if self.breaker and not self.breaker.acquire(url, deadline):
+                    if self._out_of_time(deadline):
+                        return self._time_budget(url)
+                    # Report the real failure of an earlier attempt if there was one
+                    return page_data or self.breaker.skipped(url)
+                if self.scheduler and not self.scheduler.wait_turn(url, deadline):
+                    if self.breaker:
+                        self.breaker.release(url)  # Free the probe slot if this was the probe
+                    return self._time_budget(url)
+
+                started = time.monotonic()
+                if page_data is None:
+                    with self._lock:
+                        self._queue_waits.append(started - queued)
+                page_data = self.scraper.scrape(
+                    url,
+                    etag=validators.get('etag'),
+                    last_modified=validators.get('last_modified'),
+                    previous_hash=validators.get('content_hash'),
+                    parse=self.parse
+                )
+                if self.controller:
+                    self.controller.record(time.monotonic() - started, self._is_overload(page_data))
+
+                transient = self.retry_policy.is_transient(page_data)
+                if self.breaker:
+                    self.breaker.record(url, failed=transient, page_data=page_data)
+                deferred = page_data.retry_after is not None and self.scheduler is not None
+                if deferred:
+                    # Server told us when to come back: pause the whole host, retried or not
+                    self.scheduler.defer(url, page_data.retry_after)
+                if not transient or attempt == self.retry_policy.max_attempts:
+                    break
+
+                with self._lock:
+                    self.stats['retries'] += 1
+                if not deferred:
+                    delay = self.retry_policy.backoff(attempt)
+                    if self._out_of_time(deadline, delay):
+                        return self._time_budget(url)
+                    time.sleep(delay)
+
+            return page_data
+
+    @staticmethod
+    def _out_of_time(deadline: Optional[float], wait: float = 0.0) -> bool:
+        """True if waiting `wait` more seconds would pass the deadline."""
+        return deadline is not None and time.monotonic() + wait >= deadline
+
+    @staticmethod
+    def _time_budget(url: str) -> PageData:
+        """Result for a page whose fetch was abandoned when the time budget ran out."""
+        return PageData(url=url, error="Not fetched: time budget exhausted", error_type='time_budget')
+
+    @staticmethod
+    def _is_overload(page_data: PageData) -> bool:
+        """True for failures that suggest the origin is struggling (not 404s)."""
+        if not page_data.error:
+            return False
+        if page_data.error_type == 'network':
+            return True
+        status = page_data.status_code
+        return page_data.error_type == 'http_error' and (status == 429 or status >= 500)
+
+    def crawl(self, urls: Iterable[str], validators: Dict[str, Dict] = None,
+              deadline: Optional[float] = None) -> Iterator[PageData]:
+        """
+        Fetch all URLs concurrently.
+
+        At most `concurrency` requests (or the controller's current limit)
+        are in flight at any time, so the input iterable is consumed lazily.
+
+        Args:
+            urls: URLs to fetch
+            validators: Optional mapping of URL -> {'etag', 'last_modified',
+                'content_hash'} from a previous run, used for conditional
+                requests and change detection
+            deadline: Optional time.monotonic() value after which no new
+                fetches are started; fetches in flight stop waiting for the
+                breaker, politeness or a retry and yield a 'time_budget' error
+
+        Yields:
+            PageData for every URL fetched, as soon as its fetch completes
+        """
+        validators = validators or {}
+        pending = set()
+        url_iter = iter(urls)
+        exhausted = False
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                if not exhausted and deadline is not None and time.monotonic() >= deadline:
+                    # Out of time: drain what is in flight, leave the rest unfetched
+                    exhausted = True
+                    self.stats['deadline_reached'] = True
+
+                while not exhausted and len(pending) < self._in_flight_limit():
+                    try:
+                        url = next(url_iter)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    pending.add(executor.submit(self._fetch, url, validators.get(url, {}), deadline))
+
+                if not pending:
+                    break
+
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+
+if __name__ == "__main__":
+    class UnavailableScraper(PageScraper):
+        """Offline stand-in: every page answers 503 with Retry-After: 30."""
+
+        def scrape(self, url, **kwargs):
+            return PageData(url=url, error="503 Server Error", error_type='http_error',
+                            status_code=503, retry_after=30.0)
+
+    # Offline check: Retry-After pauses the host even when the page is not retried
+    stub = UnavailableScraper(delay=0)
+    stub_scheduler = PolitenessScheduler(stub.session, user_agent='test', default_delay=0, respect_robots=False)
+    stub_breaker = CircuitBreaker(failure_threshold=1, cooldown=0.1)
+    stub_engine = CrawlEngine(stub, scheduler=stub_scheduler, retry_policy=RetryPolicy(max_attempts=1),
+                              breaker=stub_breaker)
+    list(stub_engine.crawl(["https://shop.example/a"]))
+    assert stub_scheduler.stats['deferrals'] == 1
+    assert not stub_scheduler.wait_turn("https://shop.example/b", deadline=time.monotonic() + 5)
+    print("Retry-After with max_attempts=1: host paused")
+
+    # Offline check: a probe abandoned by the time budget (host still paused) is handed back
+    time.sleep(0.15)
+    abandoned = next(stub_engine.crawl(["https://shop.example/c"], deadline=time.monotonic() + 1))
+    assert abandoned.error_type == 'time_budget'
+    assert stub_breaker.acquire("https://shop.example/d", deadline=time.monotonic() + 1)
+    print("Abandoned half-open probe released")
+
+    # Quick test
+    engine = CrawlEngine(PageScraper(), concurrency=4)
+
+    test_urls = [
+        "https://[YOUR-DOMAIN]/blogs/blog/chto-takoe-lofery",
+        "https://[YOUR-DOMAIN]/collection/lofery",
+    ]
+
+    for data in engine.crawl(test_urls):
+        print(f"{data.url}: {data.word_count} words" + (f" (error: {data.error})" if data.error else ""))
@@ -0,0 +1,178 @@
+"""
+Duplicate Analyzer for [YOUR-DOMAIN] Content Audit
+
+Finds pages sharing the same title, meta description or H1:
+1. Exact duplicates - same text after case/whitespace normalization
+2. Near-duplicates - same words once the brand suffix/prefix
+   ("... | Магазин X"), punctuation and word order are ignored
+
+Each value is normalized once and grouped in a hash index, so the whole
+site is analyzed in O(n).
+"""
+
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+
+# Fields checked for duplicates, with their report labels
+FIELDS = {
+    'title': 'Title',
+    'meta_description': 'Meta Description',
+    'h1': 'H1',
+}
+
+# Separators between a text and a brand affix: "Лоферы | Brand", "Brand — Лоферы"
+AFFIX_SEPARATOR = re.compile(r'\s+[|–—\-:·•/»]+\s+')
+PUNCTUATION = re.compile(r'[^\w\s]')
+
+
+@dataclass
+class DuplicateGroup:
+    """Pages sharing one normalized value of a field."""
+    field: str  # 'title', 'meta_description' or 'h1'
+    kind: str  # 'exact' or 'near'
+    text: str  # Value of the first page in the group
+    pages: List[Dict] = field(default_factory=list)  # {url, text}
+
+    def to_dict(self) -> Dict:
+        # Shallow: dataclasses.asdict() deep-copies every page entry, which dominates on large sites
+        return {'field': self.field, 'kind': self.kind, 'text': self.text, 'pages': self.pages}
+
+
+def normalize(text: str) -> str:
+    """Exact-match key: Unicode NFKC, lowercase, collapsed whitespace."""
+    return ' '.join(unicodedata.normalize('NFKC', text).lower().split())
+
+
+def word_key(text: str) -> str:
+    """Near-match key: the words of a normalized text, without punctuation, in sorted order."""
+    return ' '.join(sorted(PUNCTUATION.sub(' ', text).split()))
+
+
+class DuplicateAnalyzer:
+    """Detects duplicate and near-duplicate titles, meta descriptions and H1s."""
+
+    # An affix is a brand affix if this share of a field's values carry it (and at least MIN_AFFIX_PAGES)
+    MIN_AFFIX_SHARE = 0.1
+    MIN_AFFIX_PAGES = 3
+
+    def __init__(self, fields: Optional[Dict[str, str]] = None):
+        self.fields = fields or FIELDS
+
+    def find_brand_affixes(self, segments: List[List[str]]) -> Dict[str, List[str]]:
+        """
+        Learn brand affixes from values split at AFFIX_SEPARATOR: first/last
+        segments that repeat across a large share of the values.
+        """
+        prefixes: Counter = Counter()
+        suffixes: Counter = Counter()
+        for parts in segments:
+            if len(parts) > 1:
+                prefixes[parts[0]] += 1
+                suffixes[parts[-1]] += 1
+
+        threshold = max(self.MIN_AFFIX_PAGES, self.MIN_AFFIX_SHARE * len(segments))
+        return {
+            'prefixes': [affix for affix, count in prefixes.most_common() if count >= threshold],
+            'suffixes': [affix for affix, count in suffixes.most_common() if count >= threshold],
+        }
+
+    @staticmethod
+    def strip_affixes(parts: List[str], prefixes: Set[str], suffixes: Set[str]) -> str:
+        """Join the segments of a value without a brand prefix and suffix (never the whole value)."""
+        if len(parts) > 1 and parts[-1] in suffixes:
+            parts = parts[:-1]
+        if len(parts) > 1 and parts[0] in prefixes:
+            parts = parts[1:]
+        return ' '.join(parts)
+
+    def find_duplicates(self, pages: List[Dict], field_name: str) -> Dict:
+        """
+        Group pages by one field.
+
+        Returns:
+            Dict with 'exact' and 'near' lists of DuplicateGroup (largest
+            first) and the learned 'affixes'. A near group is reported only
+            if it joins more than one exact value.
+        """
+        entries = []  # (page, original text, normalized text)
+        for page in pages:
+            text = page.get(field_name)
+            if page.get('error') or not isinstance(text, str) or not text.strip():
+                continue
+            entries.append((page, text.strip(), normalize(text)))
+
+        segments = [AFFIX_SEPARATOR.split(value) for _, _, value in entries]
+        affixes = self.find_brand_affixes(segments)
+        prefixes, suffixes = set(affixes['prefixes']), set(affixes['suffixes'])
+
+        exact: Dict[str, List] = defaultdict(list)
+        near: Dict[str, List] = defaultdict(list)
+        for entry, parts in zip(entries, segments):
+            exact[entry[2]].append(entry)
+            key = word_key(self.strip_affixes(parts, prefixes, suffixes))
+            if key:
+                near[key].append(entry)
+
+        def group(kind: str, members: List) -> DuplicateGroup:
+            return DuplicateGroup(field=field_name, kind=kind, text=members[0][1],
+                                  pages=[{'url': page['url'], 'text': text} for page, text, _ in members])
+
+        exact_groups = [group('exact', members) for members in exact.values() if len(members) > 1]
+        near_groups = [
+            group('near', members) for members in near.values()
+            if len({value for _, _, value in members}) > 1
+        ]
+        exact_groups.sort(key=lambda g: len(g.pages), reverse=True)
+        near_groups.sort(key=lambda g: len(g.pages), reverse=True)
+        return {'exact': exact_groups, 'near': near_groups, 'affixes': affixes}
+
+    def generate_analysis(self, pages: List[Dict]) -> Dict:
+        """
+        Run the duplicate check for all fields.
+
+        Args:
+            pages: List of page data dicts
+
+        Returns:
+            JSON-ready dict: per field the exact/near groups, brand affixes and
+            page counts, plus 'pages_with_duplicates' across all fields
+        """
+        result: Dict = {'fields': {}}
+        duplicated_urls = set()
+
+        for field_name in self.fields:
+            found = self.find_duplicates(pages, field_name)
+            exact_urls = {p['url'] for g in found['exact'] for p in g.pages}
+            near_urls = {p['url'] for g in found['near'] for p in g.pages}
+            duplicated_urls |= exact_urls | near_urls
+            result['fields'][field_name] = {
+                'exact_groups': len(found['exact']),
+                'exact_pages': len(exact_urls),
+                'near_groups': len(found['near']),
+                'near_pages': len(near_urls),
+                'brand_affixes': found['affixes'],
+                'exact': [g.to_dict() for g in found['exact']],
+                'near': [g.to_dict() for g in found['near']],
+            }
+
+        result['pages_with_duplicates'] = len(duplicated_urls)
+        return result
+
+
+if __name__ == "__main__":
+    # Quick test
+    import json
+
+    sample_pages = [
+        {'url': '/blogs/blog/a', 'title': 'Лоферы женские | Магазин', 'h1': 'Лоферы', 'meta_description': 'Купить лоферы'},
+        {'url': '/blogs/blog/b', 'title': 'лоферы  женские | Магазин', 'h1': 'Лоферы', 'meta_description': 'Купить лоферы'},
+        {'url': '/blogs/blog/c', 'title': 'Женские лоферы — Магазин', 'h1': 'Женские лоферы', 'meta_description': ''},
+        {'url': '/blogs/blog/d', 'title': 'Женские лоферы', 'h1': 'Туфли', 'meta_description': 'Купить туфли'},
+        {'url': '/blogs/blog/e', 'title': 'Туфли | Магазин', 'h1': 'Туфли', 'meta_description': 'Купить туфли.'},
+    ]
+    analysis = DuplicateAnalyzer().generate_analysis(sample_pages)
+    print(json.dumps(analysis, ensure_ascii=False, indent=2))
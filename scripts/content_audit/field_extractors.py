@@ -0,0 +1,261 @@
+"""
+Field Extractors for [YOUR-DOMAIN] Content Audit
+Optional per-page SEO fields, collected in a single pass over the parsed page.
+
+Each extractor names the tags it needs. A FieldSet built from the fields
+enabled for a run walks the page once over the union of those tags and hands
+every element to the extractors interested in it, so adding a field does not
+add a tree search, and fields that are not enabled cost nothing.
+
+New fields are added by subclassing FieldExtractor and calling register().
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin
+
+try:
+    from .link_graph import internal_links
+except ImportError:
+    from link_graph import internal_links
+
+
+@dataclass
+class FieldNode:
+    """A parsed element as extractors see it, independent of the parser backend."""
+    tag: str
+    attrs: Dict[str, str]  # Multi-valued attributes (rel, class) joined by spaces
+    text: Callable[[], str]  # Stripped strings joined by spaces (computed on demand)
+    raw_text: Callable[[], str]  # Unprocessed text content, e.g. a script body
+
+
+class FieldExtractor:
+    """
+    Base class of an optional field.
+
+    `start()` returns the initial PageData values of the field, `visit()`
+    updates them for every element with a tag in `tags` (in document order),
+    `finish()` post-processes them, and `report()` turns PageData into the
+    report columns listed in `columns`.
+    """
+    name: str = ''
+    tags: Tuple[str, ...] = ()
+    columns: Tuple[str, ...] = ()
+
+    def start(self) -> Dict[str, Any]:
+        return {}
+
+    def visit(self, node: FieldNode, values: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def finish(self, values: Dict[str, Any], base_url: str) -> None:
+        pass
+
+    def report(self, page_data) -> Dict[str, Any]:
+        return {column: getattr(page_data, column) for column in self.columns}
+
+
+EXTRACTORS: Dict[str, FieldExtractor] = {}
+
+
+def register(extractor: FieldExtractor) -> FieldExtractor:
+    """Make an extractor available to --fields under its name."""
+    EXTRACTORS[extractor.name] = extractor
+    return extractor
+
+
+class MetaRobotsExtractor(FieldExtractor):
+    """<meta name="robots"> content (first one), e.g. 'noindex, follow'."""
+    name = 'meta_robots'
+    tags = ('meta',)
+    columns = ('meta_robots',)
+
+    def start(self):
+        return {'meta_robots': None}
+
+    def visit(self, node, values):
+        if values['meta_robots'] is None and node.attrs.get('name', '').strip().lower() == 'robots':
+            values['meta_robots'] = node.attrs.get('content', '').strip()
+
+
+class HreflangExtractor(FieldExtractor):
+    """<link rel="alternate" hreflang> targets: language -> absolute URL (first per language)."""
+    name = 'hreflang'
+    tags = ('link',)
+    columns = ('hreflang',)
+
+    def start(self):
+        return {'hreflang': {}}
+
+    def visit(self, node, values):
+        language = node.attrs.get('hreflang', '').strip()
+        href = node.attrs.get('href', '').strip()
+        if language and href and 'alternate' in node.attrs.get('rel', '').lower().split():
+            values['hreflang'].setdefault(language.lower(), href)
+
+    def finish(self, values, base_url):
+        values['hreflang'] = {lang: urljoin(base_url, href) for lang, href in values['hreflang'].items()}
+
+
+class JsonLdExtractor(FieldExtractor):
+    """<script type="application/ld+json"> blocks; reports their @type values and unparseable blocks."""
+    name = 'json_ld'
+    tags = ('script',)
+    columns = ('json_ld_types', 'json_ld_invalid')
+
+    def start(self):
+        return {'json_ld': [], 'json_ld_invalid': 0}
+
+    def visit(self, node, values):
+        if node.attrs.get('type', '').split(';')[0].strip().lower() != 'application/ld+json':
+            return
+        try:
+            values['json_ld'].append(json.loads(node.raw_text()))
+        except ValueError:
+            values['json_ld_invalid'] += 1
+
+    def report(self, page_data):
+        return {'json_ld_types': json_ld_types(page_data.json_ld), 'json_ld_invalid': page_data.json_ld_invalid}
+
+
+def json_ld_types(blocks: List[Any]) -> List[str]:
+    """Distinct @type values of JSON-LD blocks, including items of @graph and top-level lists."""
+    types: List[str] = []
+    stack = list(reversed(blocks))
+    while stack:
+        item = stack.pop()
+        if isinstance(item, list):
+            stack.extend(reversed(item))
+        elif isinstance(item, dict):
+            declared = item.get('@type')
+            for name in declared if isinstance(declared, list) else [declared]:
+                if isinstance(name, str) and name not in types:
+                    types.append(name)
+            if isinstance(item.get('@graph'), list):
+                stack.extend(reversed(item['@graph']))
+    return types
+
+
+class OutlineExtractor(FieldExtractor):
+    """H2/H3 headings in document order, as 'h2: text'."""
+    name = 'outline'
+    tags = ('h2', 'h3')
+    columns = ('outline',)
+
+    def start(self):
+        return {'outline': []}
+
+    def visit(self, node, values):
+        text = node.text()
+        if text:
+            values['outline'].append(f"{node.tag}: {text}")
+
+
+class ImageAltExtractor(FieldExtractor):
+    """Image count and images without a non-empty alt attribute."""
+    name = 'image_alt'
+    tags = ('img',)
+    columns = ('images', 'images_without_alt', 'image_alt_coverage')
+
+    def start(self):
+        return {'images': 0, 'images_without_alt': 0}
+
+    def visit(self, node, values):
+        values['images'] += 1
+        if not node.attrs.get('alt', '').strip():
+            values['images_without_alt'] += 1
+
+    def report(self, page_data):
+        coverage = None
+        if page_data.images:
+            coverage = round(1 - page_data.images_without_alt / page_data.images, 3)
+        return {'images': page_data.images, 'images_without_alt': page_data.images_without_alt,
+                'image_alt_coverage': coverage}
+
+
+class OutlinksExtractor(FieldExtractor):
+    """
+    Internal links (<a href> on the same host, not rel="nofollow") as
+    site paths, for the link graph. Kept in the cache, not a CSV column.
+    """
+    name = 'outlinks'
+    tags = ('a',)
+
+    def start(self):
+        return {'outlinks': []}
+
+    def visit(self, node, values):
+        href = node.attrs.get('href', '').strip()
+        if href and 'nofollow' not in node.attrs.get('rel', '').lower().split():
+            values['outlinks'].append(href)
+
+    def finish(self, values, base_url):
+        values['outlinks'] = internal_links(base_url, values['outlinks'])
+
+    def report(self, page_data):
+        return {'outlinks': page_data.outlinks}
+
+
+for _extractor in (MetaRobotsExtractor(), HreflangExtractor(), JsonLdExtractor(),
+                   OutlineExtractor(), ImageAltExtractor(), OutlinksExtractor()):
+    register(_extractor)
+
+
+class FieldSet:
+    """The optional fields enabled for a run."""
+
+    def __init__(self, names: Iterable[str] = ()):
+        names = list(names)
+        unknown = [name for name in names if name not in EXTRACTORS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)} (available: {', '.join(EXTRACTORS)})")
+        self.extractors = [EXTRACTORS[name] for name in dict.fromkeys(names)]
+        self.by_tag: Dict[str, List[FieldExtractor]] = {}
+        for extractor in self.extractors:
+            for tag in extractor.tags:
+                self.by_tag.setdefault(tag, []).append(extractor)
+
+    def __bool__(self) -> bool:
+        return bool(self.extractors)
+
+    @property
+    def names(self) -> List[str]:
+        return [extractor.name for extractor in self.extractors]
+
+    @property
+    def tags(self) -> Tuple[str, ...]:
+        """Union of the tags the enabled extractors need."""
+        return tuple(self.by_tag)
+
+    @property
+    def columns(self) -> List[str]:
+        return [column for extractor in self.extractors for column in extractor.columns]
+
+    def collect(self, nodes: Iterator[FieldNode], base_url: str) -> Dict[str, Any]:
+        """Run the enabled extractors over the nodes of one page; returns PageData values."""
+        values: Dict[str, Any] = {}
+        for extractor in self.extractors:
+            values.update(extractor.start())
+        for node in nodes:
+            for extractor in self.by_tag.get(node.tag, ()):
+                extractor.visit(node, values)
+        for extractor in self.extractors:
+            extractor.finish(values, base_url)
+        return values
+
+    def report(self, page_data) -> Dict[str, Any]:
+        """Report columns of the enabled fields for a page."""
+        row: Dict[str, Any] = {}
+        for extractor in self.extractors:
+            row.update(extractor.report(page_data))
+        return row
+
+
+def parse_field_names(value: Optional[str]) -> List[str]:
+    """Parse a --fields value: comma-separated names, or 'all'."""
+    if not value:
+        return []
+    if value.strip() == 'all':
+        return list(EXTRACTORS)
+    return [name.strip() for name in value.split(',') if name.strip()]
@@ -0,0 +1,133 @@
+"""
+Freshness Policy for [YOUR-DOMAIN] Content Audit
+Decides when a cached page must be refreshed, and detects unchanged bodies cheaply.
+"""
+
+import hashlib
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+
+def content_hash(body: bytes) -> str:
+    """Fingerprint of a raw response body."""
+    return hashlib.sha1(body).hexdigest()
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO timestamp stored in the cache (None if missing or invalid)."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def fetch_age(page: Dict, now: Optional[datetime] = None) -> timedelta:
+    """Time since the page was fetched (infinite if unknown)."""
+    fetched_at = parse_timestamp(page.get('fetched_at'))
+    if fetched_at is None:
+        # Cached before fetch times were recorded: refresh once
+        return timedelta.max
+    return (now or datetime.now()) - fetched_at
+
+
+class StalenessPolicy:
+    """
+    Decides whether a cached page can be trusted.
+
+    - Pages the sitemap gives no `lastmod` for are trusted only for `ttl_days`
+      after they were fetched, since the sitemap cannot tell us they changed.
+      Pages with `lastmod` are refreshed when it changes, as before.
+    - Failed pages are normally fetched again on the next run. Permanent
+      failures (404/410) are a negative cache entry: they are skipped for
+      `negative_ttl_days` and keep their cached error state in the reports.
+    """
+
+    NEGATIVE_STATUSES = {404, 410}
+
+    def __init__(self, ttl_days: float = 7.0, negative_ttl_days: float = 7.0):
+        self.ttl = timedelta(days=ttl_days)
+        self.negative_ttl = timedelta(days=negative_ttl_days)
+
+    def is_negative(self, cached: Dict) -> bool:
+        """True if the cached page is a remembered permanent failure."""
+        return bool(cached.get('error')) and cached.get('status_code') in self.NEGATIVE_STATUSES
+
+    def is_stale(self, cached: Dict, lastmod: Optional[str], now: Optional[datetime] = None) -> bool:
+        """True if the cached page should be fetched again."""
+        if cached.get('error'):
+            if not self.is_negative(cached):
+                return True
+            return fetch_age(cached, now) >= self.negative_ttl
+
+        if lastmod is not None:
+            return False
+        return fetch_age(cached, now) >= self.ttl
+
+    def is_expired(self, cached: Dict, now: Optional[datetime] = None) -> bool:
+        """True once the cached page is older than the TTL, regardless of lastmod."""
+        return fetch_age(cached, now) >= self.ttl
+
+
+class RecrawlPolicy:
+    """
+    Per-URL recrawl interval learned from how often the page actually changed.
+
+    Every cached page carries `first_seen` and a `change_history` of fetch
+    times at which its content was different from the previous fetch. The
+    change rate is estimated as changes / observed time, and the page is
+    due again after about one expected change interval:
+
+        interval = (fetched_at - first_seen) / (changes + 1), clamped to [min, max]
+
+    A page that never changes doubles its interval on every visit up to
+    `max_days`; a page that changes on most visits stays near `min_days`.
+    """
+
+    MAX_HISTORY = 20  # Recent changes kept per URL; older ones move first_seen forward
+
+    def __init__(self, min_days: float = 1.0, max_days: float = 30.0):
+        self.min_interval = timedelta(days=min_days)
+        self.max_interval = timedelta(days=max(min_days, max_days))
+
+    @staticmethod
+    def changed(previous: Dict, page: Dict) -> bool:
+        """Compare two fetches of a URL: content hash if both have one, else sitemap lastmod."""
+        if previous.get('content_hash') and page.get('content_hash'):
+            return previous['content_hash'] != page['content_hash']
+        if previous.get('lastmod') and page.get('lastmod'):
+            return previous['lastmod'] != page['lastmod']
+        return False
+
+    def update_history(self, page: Dict, previous: Optional[Dict]) -> None:
+        """Carry the change history over from the previous record and add this fetch if it changed."""
+        fetched_at = page.get('fetched_at')
+        if previous is None:
+            page['first_seen'] = fetched_at
+            page['change_history'] = []
+            return
+
+        first_seen = previous.get('first_seen') or previous.get('fetched_at') or fetched_at
+        history: List[str] = list(previous.get('change_history') or [])
+        if not page.get('error') and not previous.get('error') and self.changed(previous, page):
+            history.append(fetched_at)
+        if len(history) > self.MAX_HISTORY:
+            first_seen = history[-self.MAX_HISTORY - 1]
+            history = history[-self.MAX_HISTORY:]
+
+        page['first_seen'] = first_seen
+        page['change_history'] = history
+
+    def interval(self, page: Dict) -> timedelta:
+        """Expected time between changes of the page, observed up to its last fetch."""
+        first_seen = parse_timestamp(page.get('first_seen'))
+        fetched_at = parse_timestamp(page.get('fetched_at'))
+        if first_seen is None or fetched_at is None:
+            return self.min_interval
+        estimate = (fetched_at - first_seen) / (len(page.get('change_history') or []) + 1)
+        return min(self.max_interval, max(self.min_interval, estimate))
+
+    def is_due(self, cached: Dict, now: Optional[datetime] = None) -> bool:
+        """True once the page's own recrawl interval has elapsed since its last fetch."""
+        return fetch_age(cached, now) >= self.interval(cached)
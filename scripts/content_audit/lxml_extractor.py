@@ -0,0 +1,207 @@
+"""
+lxml Extractor for [YOUR-DOMAIN] Content Audit
+Fast-path page extraction that skips building a BeautifulSoup tree.
+
+The BeautifulSoup backend runs lxml's HTML parser and then copies every node
+into Python objects before searching them once per field and once per content
+selector. This backend keeps lxml's own C tree and lets lxml find the few
+elements that matter. It reproduces BeautifulSoup's semantics (first
+match per field, class token matching, which strings get_text() counts), so
+both backends give the same PageData.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from lxml import etree
+
+try:
+    from .content_selectors import SelectorEngine, has_text
+    from .boilerplate import BoilerplateModel, block_step
+    from .field_extractors import FieldSet, FieldNode
+except ImportError:
+    from content_selectors import SelectorEngine, has_text
+    from boilerplate import BoilerplateModel, block_step
+    from field_extractors import FieldSet, FieldNode
+
+
+# Strings inside these elements are not NavigableStrings in BeautifulSoup
+# (Script, Stylesheet, TemplateString, RubyText...), so get_text() skips them
+NON_TEXT_TAGS = {'script', 'style', 'template', 'rt', 'rp'}
+
+
+@dataclass
+class ExtractedFields:
+    """Raw fields found in a page, before they are stored on PageData."""
+    title: Optional[str] = None
+    h1: Optional[str] = None
+    meta_description: Optional[str] = None
+    canonical_href: Optional[str] = None
+    content_text: str = ""
+    blocks: List[str] = field(default_factory=list)  # Fingerprints for the boilerplate model
+    extra: Dict[str, Any] = field(default_factory=dict)  # Values of the optional fields
+
+
+def _parse(body: bytes) -> Optional[etree._Element]:
+    """
+    Parse a body the way the BeautifulSoup backend sees it: as UTF-8 with
+    invalid bytes replaced. Valid UTF-8 is handed to lxml as raw bytes.
+
+    huge_tree lifts libxml2's nesting limit, which BeautifulSoup's
+    event-driven parser does not hit either.
+    """
+    try:
+        body.decode('utf-8')
+        parser = etree.HTMLParser(encoding='utf-8', recover=True, strip_cdata=False, huge_tree=True)
+        parser.feed(body)
+    except UnicodeDecodeError:
+        parser = etree.HTMLParser(recover=True, strip_cdata=False, huge_tree=True)
+        parser.feed(body.decode('utf-8', errors='replace'))
+    try:
+        return parser.close()
+    except etree.XMLSyntaxError:
+        # Empty or whitespace-only document
+        return None
+
+
+def _strings(element: etree._Element, skip_tags=(), in_non_text: bool = False,
+             skip_elements: Set = frozenset()) -> Iterator[str]:
+    """
+    Text nodes of an element in document order, as get_text() sees them.
+    Descendants in `skip_tags` or `skip_elements` are left out together with
+    their text, but the text following them (their tail) is kept. Iterative,
+    so deeply nested pages do not hit the recursion limit.
+    """
+    stack = [(element, in_non_text)]
+    while stack:
+        item, hidden = stack.pop()
+        if isinstance(item, str):
+            yield item
+            continue
+        hidden = hidden or item.tag in NON_TEXT_TAGS
+        if item.text and not hidden:
+            yield item.text
+        # Pushed in reverse so each child's subtree comes before its tail
+        for child in reversed(item):
+            if child.tail and not hidden:
+                stack.append((child.tail, hidden))
+            # Comments and processing instructions have a non-string tag
+            if isinstance(child.tag, str) and child.tag not in skip_tags and child not in skip_elements:
+                stack.append((child, hidden))
+
+
+def _stripped(element: etree._Element, skip_tags=(), skip_elements: Set = frozenset()) -> Iterator[str]:
+    """Non-empty stripped strings of an element, as BeautifulSoup's stripped_strings."""
+    in_non_text = any(ancestor.tag in NON_TEXT_TAGS for ancestor in element.iterancestors())
+    for string in _strings(element, skip_tags, in_non_text, skip_elements):
+        string = string.strip()
+        if string:
+            yield string
+
+
+def get_text(element: etree._Element, separator: str = '', skip_tags=(), skip_elements: Set = frozenset()) -> str:
+    """Equivalent of BeautifulSoup's get_text(separator, strip=True)."""
+    return separator.join(_stripped(element, skip_tags, skip_elements))
+
+
+def iter_blocks(body: etree._Element, max_depth: int) -> Iterator[Tuple[etree._Element, int, str]]:
+    """(element, depth, DOM path) of the elements up to `max_depth` levels below <body>, in document order."""
+    def walk(parent, depth, prefix):
+        for child in parent:
+            if not isinstance(child.tag, str):
+                continue
+            path = prefix + '/' + block_step(child.tag, child.get('id'), (child.get('class') or '').split())
+            yield child, depth, path
+            if depth < max_depth:
+                yield from walk(child, depth + 1, path)
+    return walk(body, 1, 'body')
+
+
+def extract_fields(body: bytes, engine: SelectorEngine, removed_tags: List[str],
+                   template: Optional[str] = None,
+                   boilerplate: Optional[BoilerplateModel] = None,
+                   field_set: Optional[FieldSet] = None, base_url: str = '') -> ExtractedFields:
+    """
+    Find title, H1, meta description, canonical and main content.
+
+    The head fields come from one C-level pass over the four tags involved;
+    content candidates from the engine's compiled XPath, so Python only
+    touches matching elements. `removed_tags` are dropped from the content,
+    and with a `boilerplate` model so are the template's boilerplate blocks.
+    The optional fields of `field_set` are collected in one more C-level pass.
+    """
+    fields = ExtractedFields()
+    root = _parse(body)
+
+    if field_set:
+        elements = root.iter(*field_set.tags) if root is not None else ()
+        nodes = (FieldNode(element.tag, dict(element.attrib),
+                           lambda element=element: get_text(element, ' '),
+                           lambda element=element: element.text or '')
+                 for element in elements)
+        fields.extra = field_set.collect(nodes, base_url)
+
+    if root is None:
+        return fields
+
+    title = h1 = meta = link = None
+    for element in root.iter('title', 'h1', 'meta', 'link'):
+        tag = element.tag
+        if tag == 'title':
+            title = title if title is not None else element
+        elif tag == 'h1':
+            h1 = h1 if h1 is not None else element
+        elif tag == 'meta':
+            if meta is None and element.get('name') == 'description':
+                meta = element
+        elif link is None and 'canonical' in (element.get('rel') or '').split():
+            link = element
+
+    if title is not None:
+        fields.title = get_text(title)
+    if h1 is not None:
+        fields.h1 = get_text(h1)
+    if meta is not None and meta.get('content'):
+        fields.meta_description = meta.get('content').strip()
+    if link is not None and link.get('href'):
+        fields.canonical_href = link.get('href').strip()
+
+    def protected(element) -> bool:
+        return bool(engine.matches(element.tag, element.get('id'), (element.get('class') or '').split()))
+
+    body_element = next(root.iter('body'), None)
+    dropped: Set = set()
+    if boilerplate is not None and template and body_element is not None:
+        fields.blocks, dropped_blocks = boilerplate.scan(
+            template, iter_blocks(body_element, boilerplate.MAX_DEPTH),
+            lambda element: get_text(element, ' '), protected)
+        dropped = set(dropped_blocks)
+
+    def find(start: int, stop: int) -> Dict:
+        candidates = {}
+        for element in engine.xpath(start, stop)(root):
+            if dropped and (element in dropped or any(a in dropped for a in element.iterancestors())):
+                continue
+            classes = (element.get('class') or '').split()
+            for index in engine.matches(element.tag, element.get('id'), classes, start, stop):
+                candidates.setdefault(index, element)
+            if len(candidates) == stop - start:
+                break
+        return candidates
+
+    def qualifies(element) -> bool:
+        return has_text(_stripped(element, skip_elements=dropped), engine.min_chars)
+
+    skip_tags = set(removed_tags)
+    main_content = engine.find_main_content(find, qualifies, template)
+    if main_content is not None:
+        text = get_text(main_content, ' ', skip_tags, dropped)
+        fields.content_text = re.sub(r'\s+', ' ', text)
+    elif boilerplate is not None and template and body_element is not None and boilerplate.is_trained(template):
+        # No selector matched: what is left of <body> without boilerplate is the content
+        text = get_text(body_element, ' ', skip_tags, dropped)
+        if len(text) > engine.min_chars:
+            fields.content_text = re.sub(r'\s+', ' ', text)
+
+    return fields
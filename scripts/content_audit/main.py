@@ -7,21 +7,42 @@ Usage:
     python scripts/content_audit/main.py --full
     python scripts/content_audit/main.py --sitemap-only
     python scripts/content_audit/main.py --update-webmaster
+    python scripts/content_audit/main.py --retry-failed
+    python scripts/content_audit/main.py --full --resume
+    python scripts/content_audit/main.py --full --shard 1/4
+    python scripts/content_audit/main.py --merge
+    python scripts/content_audit/main.py --replay crawl.warc.gz
 """
 
 import argparse
 import sys
 import json
 import os
+import re
+import time
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
+from urllib.parse import urlsplit
 from tqdm import tqdm
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from sitemap_parser import SitemapParser
-from page_scraper import PageScraper
+from sitemap_parser import SitemapParser, SitemapEntry
+from page_scraper import PageScraper, PageData
+from crawler import CrawlEngine
+from politeness import PolitenessScheduler
+from adaptive_concurrency import AdaptiveConcurrency
+from retry import RetryPolicy, CircuitBreaker
+from freshness import StalenessPolicy, RecrawlPolicy
+from url_aliases import alias_map, collapse_aliases
+from link_graph import annotate_pages
+from warc import WarcWriter, WarcArchive, WarcReplayAdapter
+from sampling import stratified_sample, url_section
+from boilerplate import BoilerplateModel
+from field_extractors import EXTRACTORS, parse_field_names
+from pipeline import ParsePipeline
 from keyword_extractor import KeywordExtractor
 from webmaster_data import WebmasterDataParser
 from report_generator import ReportGenerator
@@ -29,20 +50,119 @@ from report_generator import ReportGenerator
 
 CACHE_FILE = Path("research/content-audit/.cache.json")
 LOG_FILE = Path("research/content-audit/audit-log.txt")
+REQUEUE_FILE = Path("research/content-audit/.requeue.json")
+JOURNAL_FILE = Path("research/content-audit/.progress.jsonl")
+SNAPSHOT_FILE = Path("research/content-audit/.sitemap-snapshot.json")
+BOILERPLATE_FILE = Path("research/content-audit/.boilerplate.json")
 
 
 class ContentAuditor:
     """Main content audit orchestrator."""
 
-    def __init__(self, output_format='both'):
-        self.sitemap_parser = SitemapParser()
-        self.page_scraper = PageScraper(delay=0.5)
+    def __init__(self, output_format='both', concurrency=8, per_host_limit=4,
+                 delay=0.5, respect_robots=True, adaptive=False, max_concurrency=32,
+                 target_p95=2.0, max_retries=2, max_page_size_mb=5.0, shard=None,
+                 max_age_days=7.0, negative_ttl_days=7.0, order='sitemap', time_budget=None,
+                 adaptive_recrawl=False, min_recrawl_days=1.0, max_recrawl_days=30.0,
+                 warc_path=None, replay_path=None, sample_size=None, sample_rate=None,
+                 parse_workers=0, extractor='bs4', boilerplate=False, fields=()):
+        # Offline replay: no pacing, no retries, every fetch answered from the archive
+        self.replay_path = replay_path
+        if replay_path:
+            max_retries = 0
+
+        self.sitemap_parser = SitemapParser(workers=per_host_limit)  # Child sitemaps share the host limit
+        self.page_scraper = PageScraper(delay=delay, max_body_bytes=int(max_page_size_mb * 1024 * 1024),
+                                        extractor=extractor, fields=fields)
+        self.scheduler = PolitenessScheduler(
+            self.page_scraper.session,
+            user_agent=PageScraper.HEADERS['User-Agent'],
+            default_delay=delay,
+            respect_robots=respect_robots,
+            throttle=not replay_path
+        )
+        self.controller = None
+        if adaptive:
+            if max_concurrency > per_host_limit:
+                # The limit caps each host's slots too, so it can never go past the per-host limit
+                self.log(f"Adaptive concurrency capped at --per-host-limit {per_host_limit} "
+                         f"(--max-concurrency {max_concurrency})")
+            self.controller = AdaptiveConcurrency(
+                initial=concurrency,
+                max_limit=min(max_concurrency, per_host_limit),
+                target_p95=target_p95,
+                log=self.log
+            )
+        self.breaker = None if replay_path else CircuitBreaker()
+        self.crawl_engine = CrawlEngine(self.page_scraper, concurrency=concurrency,
+                                        per_host_limit=per_host_limit,
+                                        scheduler=self.scheduler,
+                                        controller=self.controller,
+                                        retry_policy=RetryPolicy(max_attempts=max_retries + 1),
+                                        breaker=self.breaker,
+                                        parse=not parse_workers)
+        # Pipeline mode: fetch threads hand raw bodies to a pool of parser processes
+        self.parse_pipeline = ParsePipeline(workers=parse_workers, extractor=extractor,
+                                            fields=fields) if parse_workers else None
+        self.staleness = StalenessPolicy(ttl_days=max_age_days, negative_ttl_days=negative_ttl_days)
+        self.recrawl = RecrawlPolicy(min_days=min_recrawl_days, max_days=max_recrawl_days)
+        self.adaptive_recrawl = adaptive_recrawl
         self.keyword_extractor = KeywordExtractor()
         self.webmaster_parser = WebmasterDataParser()
         self.report_generator = ReportGenerator()
+        self.report_generator.extra_columns = self.page_scraper.field_set.columns
+        # Latency in the reports covers only pages fetched by this process
+        self.report_generator.run_started = datetime.now().isoformat(timespec='seconds')
         self.output_format = output_format
+        self.order = order
+        self.sample_size = sample_size
+        self.sample_rate = sample_rate
+        self.time_budget = time_budget  # Minutes for the whole --full run (None = unlimited)
         self.output_dir = Path("research/content-audit")
         self.cache = {}
+        self.requeue = []
+        self.home_page = None  # Home page outlinks for the link graph, fetched once (see _home_page)
+
+        # Shard runs (--shard i/N) keep their own cache, journal and requeue files
+        self.shard = shard
+        self.cache_file = CACHE_FILE
+        self.journal_file = JOURNAL_FILE
+        self.requeue_file = REQUEUE_FILE
+        self.snapshot_file = SNAPSHOT_FILE
+        self.boilerplate_file = BOILERPLATE_FILE
+        if shard:
+            suffix = f".shard-{shard[0]}-of-{shard[1]}"
+            self.cache_file = CACHE_FILE.with_name(f".cache{suffix}.json")
+            self.journal_file = JOURNAL_FILE.with_name(f".progress{suffix}.jsonl")
+            self.requeue_file = REQUEUE_FILE.with_name(f".requeue{suffix}.json")
+            self.snapshot_file = SNAPSHOT_FILE.with_name(f".sitemap-snapshot{suffix}.json")
+            self.boilerplate_file = BOILERPLATE_FILE.with_name(f".boilerplate{suffix}.json")
+
+        # Replay runs keep their own state files so they never overwrite the live cache
+        if replay_path:
+            self.cache_file = CACHE_FILE.with_name(".cache.replay.json")
+            self.journal_file = JOURNAL_FILE.with_name(".progress.replay.jsonl")
+            self.requeue_file = REQUEUE_FILE.with_name(".requeue.replay.json")
+            self.snapshot_file = SNAPSHOT_FILE.with_name(".sitemap-snapshot.replay.json")
+            self.boilerplate_file = BOILERPLATE_FILE.with_name(".boilerplate.replay.json")
+            adapter = WarcReplayAdapter(WarcArchive(replay_path))
+            for session in (self.page_scraper.session, self.sitemap_parser.session):
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+
+        # Site boilerplate model (--boilerplate), learned across runs
+        self.boilerplate = self.load_boilerplate() if boilerplate else None
+        self.page_scraper.boilerplate = self.boilerplate
+        if self.parse_pipeline:
+            self.parse_pipeline.boilerplate = self.boilerplate
+
+        # Record every response of this run to a WARC archive (--warc)
+        self.warc_writer = None
+        if warc_path:
+            self.warc_writer = WarcWriter(warc_path)
+            self.page_scraper.recorder = self.warc_writer
+            self.sitemap_parser.recorder = self.warc_writer
+            self.scheduler.recorder = self.warc_writer
 
     def log(self, message: str):
         """Log message to both console and file."""
@@ -56,9 +176,9 @@ class ContentAuditor:
 
     def load_cache(self):
         """Load cached page data."""
-        if CACHE_FILE.exists():
+        if self.cache_file.exists():
             try:
-                with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
                     self.cache = json.load(f)
                 self.log(f"Loaded cache with {len(self.cache)} entries")
             except Exception as e:
@@ -68,14 +188,75 @@ class ContentAuditor:
     def save_cache(self, pages: list):
         """Save page data to cache."""
         try:
-            CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
             cache_data = {p['url']: p for p in pages}
-            with open(CACHE_FILE, 'w', encoding='utf-8') as f:
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
                 json.dump(cache_data, f, ensure_ascii=False, indent=2)
             self.log(f"Saved {len(cache_data)} entries to cache")
         except Exception as e:
             self.log(f"Cache save error: {e}")
 
+    def load_snapshot(self):
+        """Load the {url: lastmod} sitemap snapshot of the previous run (None if missing)."""
+        if not self.snapshot_file.exists():
+            return None
+        try:
+            with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            self.log(f"Snapshot load error: {e}")
+            return None
+
+    def save_snapshot(self, entries: list):
+        """Persist the sitemap entries of this run for the next --incremental diff."""
+        self.snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.snapshot_file, 'w', encoding='utf-8') as f:
+            json.dump(SitemapParser.snapshot(entries), f, ensure_ascii=False, indent=2)
+
+    def load_boilerplate(self) -> BoilerplateModel:
+        """Load the boilerplate model of previous runs (empty if missing or unreadable)."""
+        try:
+            return BoilerplateModel.load(self.boilerplate_file)
+        except Exception as e:
+            self.log(f"Boilerplate model load error: {e}")
+            return BoilerplateModel()
+
+    def save_boilerplate(self):
+        """Persist the boilerplate model for the next run and log what it knows."""
+        try:
+            self.boilerplate.save(self.boilerplate_file)
+        except Exception as e:
+            self.log(f"Boilerplate model save error: {e}")
+        known = self.boilerplate.summary()
+        trained = [key for key in known if self.boilerplate.is_trained(key)]
+        self.log(f"Boilerplate model: {len(known)} templates ({len(trained)} trained), "
+                 f"{sum(known.values())} boilerplate blocks")
+
+    def load_journal(self) -> dict:
+        """Load pages completed by an interrupted run from the progress journal."""
+        journaled = {}
+        if not self.journal_file.exists():
+            return journaled
+
+        with open(self.journal_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    page = json.loads(line)
+                except json.JSONDecodeError:
+                    # Last line may be cut off by the crash
+                    continue
+                # Failed pages are fetched again on resume
+                if not page.get('error'):
+                    journaled[page['url']] = page
+
+        self.log(f"Resuming: {len(journaled)} pages recovered from {self.journal_file}")
+        return journaled
+
+    def clear_journal(self):
+        """Delete the progress journal once its pages are safely in the cache."""
+        if self.journal_file.exists():
+            self.journal_file.unlink()
+
     def _create_latest_symlinks(self, csv_path=None, json_path=None, md_path=None):
         """Create symlinks to latest reports for easy access."""
         symlinks = [
@@ -112,11 +293,245 @@ class ContentAuditor:
         self.log(f"  Total URLs: {stats['total']}")
         self.log(f"  Blog + Collection: {stats['blog_and_collection']}")
         self.log(f"  By type: {stats['by_type']}")
+        if stats['sitemaps'] > 1 or stats['duplicates']:
+            self.log(f"  Sitemaps: {stats['sitemaps']}, duplicate URLs dropped: {stats['duplicates']}")
 
         return entries
 
-    def run_full_audit(self, force_refresh=False):
+    def _build_page_dict(self, page_data, entry) -> dict:
+        """Extract keywords and convert scraped PageData to a cache/report dict."""
+        # Extract keywords
+        if page_data.content_text and not page_data.error:
+            keywords = self.keyword_extractor.extract(page_data.content_text, top_n=10)
+            page_data.top_keywords = keywords
+
+        return {
+            'url': page_data.url,
+            'lastmod': entry.lastmod,
+            'content_type': entry.content_type,
+            'title': page_data.title,
+            'h1': page_data.h1,
+            'meta_description': page_data.meta_description,
+            'word_count': page_data.word_count,
+            'top_keywords': page_data.top_keywords,
+            'error': page_data.error,
+            'error_type': page_data.error_type,
+            'status_code': page_data.status_code,
+            'etag': page_data.etag,
+            'last_modified': page_data.last_modified,
+            'content_hash': page_data.content_hash,
+            'final_url': page_data.final_url,
+            'redirect_chain': page_data.redirect_chain,
+            'canonical': page_data.canonical,
+            'ttfb_ms': page_data.ttfb_ms,
+            'total_ms': page_data.total_ms,
+            'bytes': page_data.bytes,
+            **self.page_scraper.field_set.report(page_data),
+            'fetched_at': datetime.now().isoformat(timespec='seconds')
+        }
+
+    def _fetch_entries(self, to_fetch: dict, validators: dict = None, cached_count: int = 0,
+                       deadline: float = None) -> dict:
+        """
+        Crawl the given sitemap entries concurrently.
+
+        Args:
+            to_fetch: Mapping of URL -> SitemapEntry (fetched in this order)
+            validators: Optional mapping of URL -> {'etag', 'last_modified'}
+            cached_count: Pages already resolved from cache (for the progress bar)
+            deadline: Optional time.monotonic() value after which no new fetches start
+                and fetches in flight stop waiting for retries
+
+        Returns:
+            Mapping of URL -> page dict. Entries that failed transiently
+            are also collected in self.requeue. With a deadline, entries
+            not reached in time are missing from the result.
+        """
+        results = {}
+        not_modified = 0
+        self.requeue = []
+
+        self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+        with tqdm(total=cached_count + len(to_fetch), initial=cached_count, desc="Scraping pages") as pbar, \
+                open(self.journal_file, 'a', encoding='utf-8') as journal:
+            fetched = self.crawl_engine.crawl(to_fetch, validators=validators, deadline=deadline)
+            if self.parse_pipeline:
+                fetched = self.parse_pipeline.run(fetched)
+            for page_data in fetched:
+                if page_data.error_type == 'time_budget':
+                    # Abandoned mid-wait when the budget ran out: left to _fill_unfetched
+                    continue
+                entry = to_fetch[page_data.url]
+                if page_data.blocks:
+                    self.boilerplate.observe(url_section(page_data.url), page_data.blocks)
+                    page_data.blocks = []
+                if page_data.not_modified and page_data.url in self.cache:
+                    # 304 or identical body: reuse the cached extraction, refresh lastmod, validators and timing
+                    page_dict = dict(self.cache[page_data.url])
+                    page_dict['lastmod'] = entry.lastmod
+                    page_dict['etag'] = page_data.etag
+                    page_dict['last_modified'] = page_data.last_modified
+                    page_dict['ttfb_ms'] = page_data.ttfb_ms
+                    page_dict['total_ms'] = page_data.total_ms
+                    page_dict['bytes'] = page_data.bytes if page_data.bytes is not None else page_dict.get('bytes')
+                    page_dict['fetched_at'] = datetime.now().isoformat(timespec='seconds')
+                    page_dict['revalidated'] = True  # No body transferred: timing is not a page load
+                    not_modified += 1
+                else:
+                    page_dict = self._build_page_dict(page_data, entry)
+                    self.recrawl.update_history(page_dict, self.cache.get(page_data.url))
+                    if self.crawl_engine.retry_policy.is_transient(page_data):
+                        self.requeue.append({
+                            'url': entry.url,
+                            'lastmod': entry.lastmod,
+                            'content_type': entry.content_type,
+                            'error': page_data.error
+                        })
+                results[page_data.url] = page_dict
+
+                # Append-only checkpoint so an interrupted run can --resume
+                journal.write(json.dumps(page_dict, ensure_ascii=False) + '\n')
+                journal.flush()
+                pbar.update(1)
+
+        if self.boilerplate:
+            self.save_boilerplate()
+        if not_modified:
+            self.log(f"Revalidated {not_modified} unchanged pages (HTTP 304 or same content hash)")
+        for host, crawl_delay in self.scheduler.crawl_delays().items():
+            if crawl_delay:
+                self.log(f"robots.txt Crawl-delay for {host}: {crawl_delay}s")
+        if self.scheduler.stats['disallowed']:
+            self.log(f"Skipped {self.scheduler.stats['disallowed']} pages disallowed by robots.txt")
+        if self.scheduler.stats['deferrals']:
+            self.log(f"Honored Retry-After {self.scheduler.stats['deferrals']} times")
+        if self.crawl_engine.stats['retries']:
+            self.log(f"Retried transient failures {self.crawl_engine.stats['retries']} times")
+        if self.breaker:
+            for host, trips in self.breaker.open_hosts().items():
+                self.log(f"Circuit breaker opened {trips}x for {host}")
+            for host, skipped in self.breaker.skipped_by_host().items():
+                self.log(f"Host {host} was down for over {self.breaker.give_up_after / 60:g} min: "
+                         f"{skipped} pages skipped and requeued (rerun with --retry-failed)")
+        if self.controller:
+            stats = self.controller.get_stats()
+            self.log(f"Adaptive concurrency: final limit {stats['limit']}, "
+                     f"latency p50={stats['p50']:.2f}s p95={stats['p95']:.2f}s p99={stats['p99']:.2f}s "
+                     f"over {stats['samples']} fetches, {stats['backoffs']} back-offs")
+            waits = self.crawl_engine.queue_wait_stats()
+            self.log(f"Queue wait before the first request (host slot, breaker, politeness): "
+                     f"p50={waits['p50']:.2f}s p95={waits['p95']:.2f}s")
+
+        return results
+
+    def _home_page(self, pages_data: list) -> Optional[dict]:
+        """
+        Outlinks of the site's home page, the start of click depths (--link-graph).
+        The home page is not in the audited sitemap entries, so it is fetched
+        once per run, through the crawl engine like every other page (robots.txt,
+        politeness, Retry-After and the circuit breaker apply); None if the link
+        graph is off or the fetch fails.
+        """
+        if 'outlinks' not in self.page_scraper.field_set.names:
+            return None
+        if self.home_page is None:
+            parts = urlsplit(pages_data[0]['url'])
+            page_data = next(self.crawl_engine.crawl([f"{parts.scheme}://{parts.netloc}/"]))
+            if page_data.body is not None:
+                # Pipeline mode fetches raw bodies; one page is parsed in-process
+                body, page_data.body = page_data.body, None
+                self.page_scraper.parse_page(page_data, body)
+            if page_data.error:
+                self.log(f"Link graph: could not fetch home page {page_data.url} ({page_data.error})")
+                self.home_page = {}
+            else:
+                self.home_page = {'url': page_data.final_url or page_data.url, 'outlinks': page_data.outlinks}
+        return self.home_page or None
+
+    def _report_pages(self, pages_data: list) -> list:
+        """Report rows: aliases collapsed, link graph columns added when pages have outlinks."""
+        # One row per canonical page; redirecting/canonicalized URLs are listed as aliases
+        report_pages = collapse_aliases(pages_data)
+        if len(report_pages) < len(pages_data):
+            self.log(f"Collapsed {len(pages_data) - len(report_pages)} alias URLs into their canonical pages")
+
+        started = time.time()
+        graph = annotate_pages(report_pages, self._home_page(report_pages) if report_pages else None)
+        if graph is not None:
+            self.log(f"Link graph: {len(graph):,} pages, {graph.edges:,} internal links "
+                     f"({time.time() - started:.1f}s)")
+        return report_pages
+
+    def _write_reports(self, pages_data: list):
+        """Generate the configured reports and refresh the *-latest symlinks."""
+        pages_data = self._report_pages(pages_data)
+        self.report_generator.dns_ms_by_host = self.page_scraper.dns_times()
+
+        csv_path = json_path = None
+        if self.output_format in ('csv', 'both'):
+            csv_path = self.report_generator.generate_csv(pages_data)
+            self.log(f"CSV report: {csv_path}")
+
+        # Duplicates, latency and link graph summaries are computed once for both JSON and markdown
+        summary = self.report_generator.calculate_summary(pages_data)
+
+        if self.output_format in ('json', 'both'):
+            json_path = self.report_generator.generate_json(pages_data, summary=summary)
+            self.log(f"JSON report: {json_path}")
+
+        # Always generate markdown summary
+        md_path = self.report_generator.generate_markdown_summary(pages_data, summary=summary)
+        self.log(f"Markdown summary: {md_path}")
+
+        # Create symlinks to latest reports for easy access
+        self._create_latest_symlinks(csv_path, json_path, md_path)
+
+    def save_requeue(self):
+        """Write URLs whose last fetch failed transiently to the requeue file."""
+        if self.requeue:
+            self.requeue_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.requeue_file, 'w', encoding='utf-8') as f:
+                json.dump(self.requeue, f, ensure_ascii=False, indent=2)
+            self.log(f"{len(self.requeue)} failed URLs written to {self.requeue_file} (rerun with --retry-failed)")
+        elif self.requeue_file.exists():
+            self.requeue_file.unlink()
+
+    def _order_by_impressions(self, to_fetch: dict) -> dict:
+        """Reorder entries so the URLs with the most search impressions are fetched first."""
+        self.webmaster_parser.load_latest_reports()
+        impressions = {url: self.webmaster_parser.get_total_impressions(url) for url in to_fetch}
+        with_data = sum(1 for count in impressions.values() if count)
+        self.log(f"Fetch order: by impressions ({with_data} of {len(to_fetch)} pages have webmaster data)")
+        # Stable sort: pages without data keep sitemap order at the end
+        return dict(sorted(to_fetch.items(), key=lambda item: -impressions[item[0]]))
+
+    def _fill_unfetched(self, to_fetch: dict, results: dict) -> None:
+        """Resolve entries skipped by the time budget: cached data if any, else a placeholder."""
+        unfetched = [entry for url, entry in to_fetch.items() if url not in results]
+        if not unfetched:
+            return
+
+        from_cache = 0
+        for entry in unfetched:
+            if entry.url in self.cache:
+                results[entry.url] = self.cache[entry.url]
+                from_cache += 1
+            else:
+                placeholder = PageData(url=entry.url, error="Not fetched: time budget exhausted",
+                                       error_type='time_budget')
+                results[entry.url] = self._build_page_dict(placeholder, entry)
+
+        self.log(f"Time budget exhausted: {len(unfetched)} pages not fetched "
+                 f"({from_cache} reused from cache, {len(unfetched) - from_cache} without data)")
+
+    def run_full_audit(self, force_refresh=False, resume=False, incremental=False):
         """Run full content audit."""
+        started = time.monotonic()
+        deadline = started + self.time_budget * 60 if self.time_budget else None
+        if self.replay_path:
+            # Re-extract every archived page; nothing is reused from a previous replay
+            force_refresh = True
+
         self.log("=" * 70)
         self.log("STARTING FULL CONTENT AUDIT")
         self.log("=" * 70)
@@ -125,82 +540,176 @@ class ContentAuditor:
         if not force_refresh:
             self.load_cache()
 
+        # Pages completed by an interrupted run (--resume), otherwise start a fresh journal
+        journaled = {}
+        if resume:
+            journaled = self.load_journal()
+        else:
+            self.clear_journal()
+
         # Step 1: Parse sitemap
         self.log("\n[1/5] Parsing sitemap...")
         entries = self.sitemap_parser.fetch_and_parse(filter_content=True)
+        if len(self.sitemap_parser.sitemaps) > 1 or self.sitemap_parser.duplicates:
+            self.log(f"Read {len(self.sitemap_parser.sitemaps)} sitemaps from the sitemap index, "
+                     f"dropped {self.sitemap_parser.duplicates} duplicate URLs")
         self.log(f"Found {len(entries)} blog and collection pages")
+        if self.shard:
+            entries = self.sitemap_parser.filter_shard(entries, *self.shard)
+            self.log(f"Shard {self.shard[0]}/{self.shard[1]}: {len(entries)} pages")
+        sitemap_entries = entries
+
+        # Sampling mode: crawl a stratified sample, extrapolate in the reports
+        sample_plan = None
+        if self.sample_size or self.sample_rate:
+            sample_plan = stratified_sample(entries, size=self.sample_size, rate=self.sample_rate)
+            entries = sample_plan.entries
+            self.report_generator.sample_plan = sample_plan
+            self.log(f"Sample: {len(entries)} of {sample_plan.population_size} pages "
+                     f"from {len(sample_plan.population)} strata (content type + URL section)")
+
+        # Incremental mode: diff against the previous sitemap snapshot
+        diff = None
+        if incremental:
+            previous = self.load_snapshot()
+            if previous is None:
+                self.log("No previous sitemap snapshot, running a regular audit")
+            else:
+                diff = self.sitemap_parser.diff(previous, sitemap_entries)
+                self.log(f"Sitemap diff: {len(diff.new)} new, {len(diff.changed)} changed, "
+                         f"{len(diff.removed)} removed, {len(diff.unchanged)} unchanged")
+                evicted = [url for url in diff.removed if self.cache.pop(url, None) is not None]
+                if evicted:
+                    self.log(f"Evicted {len(evicted)} removed URLs from cache")
 
         # Step 2: Scrape pages
         self.log("\n[2/5] Scraping pages...")
-        pages_data = []
-
-        with tqdm(total=len(entries), desc="Scraping pages") as pbar:
-            for entry in entries:
-                # Check cache
-                if not force_refresh and entry.url in self.cache:
-                    cached = self.cache[entry.url]
-                    # Use cache if lastmod matches
-                    if cached.get('lastmod') == entry.lastmod:
-                        pages_data.append(cached)
-                        pbar.update(1)
-                        continue
+        results = {}
+        to_fetch = {}
+        validators = {}
 
-                # Scrape page
-                page_data = self.page_scraper.scrape(entry.url)
-
-                # Extract keywords
-                if page_data.content_text and not page_data.error:
-                    keywords = self.keyword_extractor.extract(page_data.content_text, top_n=10)
-                    page_data.top_keywords = keywords
-
-                # Convert to dict
-                page_dict = {
-                    'url': page_data.url,
-                    'lastmod': entry.lastmod,
-                    'content_type': entry.content_type,
-                    'title': page_data.title,
-                    'h1': page_data.h1,
-                    'meta_description': page_data.meta_description,
-                    'word_count': page_data.word_count,
-                    'top_keywords': page_data.top_keywords,
-                    'error': page_data.error
-                }
-
-                pages_data.append(page_dict)
-                pbar.update(1)
+        # URLs known (from cache) to redirect or canonicalize to another sitemap entry
+        known_aliases = {}
+        if not force_refresh:
+            known_aliases = alias_map(self.cache[e.url] for e in entries if e.url in self.cache)
+        skipped_aliases = 0
+        not_due = 0
+
+        for entry in entries:
+            # Already done before the interruption
+            if entry.url in journaled:
+                results[entry.url] = journaled[entry.url]
+                continue
+
+            # Check cache
+            if not force_refresh and entry.url in self.cache:
+                cached = self.cache[entry.url]
+                stale = self.staleness.is_stale(cached, entry.lastmod)
+
+                # Aliases are fetched once per canonical page; re-checked only after the TTL
+                if entry.url in known_aliases and not self.staleness.is_expired(cached):
+                    results[entry.url] = cached
+                    skipped_aliases += 1
+                    continue
+
+                # Adaptive recrawl: the URL's own change rate decides when to look again,
+                # unless the sitemap reports a new lastmod
+                if self.adaptive_recrawl and not cached.get('error'):
+                    if cached.get('lastmod') == entry.lastmod and not self.recrawl.is_due(cached):
+                        results[entry.url] = cached
+                        not_due += 1
+                        continue
+                    stale = True
+
+                # Incremental: unchanged sitemap entries are not refetched unless stale
+                if diff and entry.url in diff.unchanged and not stale:
+                    results[entry.url] = cached
+                    continue
+
+                # Use cache if lastmod matches and the entry has not outlived its TTL
+                if cached.get('lastmod') == entry.lastmod and not stale:
+                    results[entry.url] = cached
+                    continue
+
+                # Otherwise revalidate with the stored HTTP validators and content hash
+                if cached.get('etag') or cached.get('last_modified') or cached.get('content_hash'):
+                    validators[entry.url] = {
+                        'etag': cached.get('etag'),
+                        'last_modified': cached.get('last_modified'),
+                        'content_hash': cached.get('content_hash')
+                    }
+            to_fetch[entry.url] = entry
+
+        if self.adaptive_recrawl:
+            self.log(f"Adaptive recrawl: {not_due} pages not due yet")
+        if self.warc_writer and results:
+            self.log(f"Note: {len(results)} pages are served from cache and will not be in the WARC archive "
+                     f"(use --force-refresh for a complete archive)")
+        if skipped_aliases:
+            self.log(f"Skipping {skipped_aliases} alias URLs (fetched via their canonical page)")
+        negative_hits = sum(1 for page in results.values() if self.staleness.is_negative(page))
+        if negative_hits:
+            self.log(f"Skipping {negative_hits} known 404/410 pages (negative cache)")
+
+        webmaster_loaded = False
+        if self.order == 'impressions' and to_fetch:
+            to_fetch = self._order_by_impressions(to_fetch)
+            webmaster_loaded = True
+
+        self.log(f"Cache hits: {len(results)}, fetching {len(to_fetch)} pages "
+                 f"({len(validators)} conditional, "
+                 f"concurrency={self.controller.limit if self.controller else self.crawl_engine.concurrency}"
+                 f"{f' adaptive (max {self.controller.max_limit})' if self.controller else ''}, "
+                 f"per-host limit={self.crawl_engine.per_host_limit}"
+                 f"{f', parse workers={self.parse_pipeline.workers}' if self.parse_pipeline else ''})")
+
+        if deadline:
+            self.log(f"Time budget: {self.time_budget:g} min, "
+                     f"{max(0.0, deadline - time.monotonic()) / 60:.1f} min left for fetching")
+        results.update(self._fetch_entries(to_fetch, validators, cached_count=len(results), deadline=deadline))
+        self._fill_unfetched(to_fetch, results)
+        self.save_requeue()
+
+        # Keep sitemap order regardless of completion order
+        pages_data = [results[entry.url] for entry in entries]
 
         self.log(f"Scraped {len(pages_data)} pages")
 
-        # Save intermediate cache
-        self.save_cache(pages_data)
+        # Save intermediate cache. A sample only adds to the cache of the full site and
+        # keeps the previous snapshot, since most changed URLs were not looked at
+        if sample_plan:
+            self.cache.update((page['url'], page) for page in pages_data)
+            self.save_cache(list(self.cache.values()))
+        else:
+            self.save_cache(pages_data)
+            self.save_snapshot(sitemap_entries)
+        self.clear_journal()
+
+        if self.warc_writer:
+            if pages_data:
+                self._home_page(pages_data)  # Record it too, so --replay has it
+            self.warc_writer.close()
+            self.log(f"WARC archive: {self.warc_writer.records} responses in {self.warc_writer.path} "
+                     f"(re-run offline with --replay {self.warc_writer.path})")
+
+        if self.shard:
+            self.log(f"Shard {self.shard[0]}/{self.shard[1]} complete: {self.cache_file}")
+            self.log("Combine all shards with --merge to generate reports")
+            return pages_data
 
         # Step 3: Extract keywords (already done in scraping)
         self.log("\n[3/5] Keywords extracted during scraping")
 
         # Step 4: Load webmaster data
         self.log("\n[4/5] Loading webmaster data...")
-        self.webmaster_parser.load_latest_reports()
+        if not webmaster_loaded:
+            self.webmaster_parser.load_latest_reports()
         pages_data = self.webmaster_parser.enrich_page_data(pages_data)
         self.log("Webmaster data enrichment complete")
 
         # Step 5: Generate reports
         self.log("\n[5/5] Generating reports...")
-        if self.output_format in ('csv', 'both'):
-            csv_path = self.report_generator.generate_csv(pages_data)
-            self.log(f"CSV report: {csv_path}")
-
-        if self.output_format in ('json', 'both'):
-            json_path = self.report_generator.generate_json(pages_data)
-            self.log(f"JSON report: {json_path}")
-
-        # Always generate markdown summary
-        md_path = self.report_generator.generate_markdown_summary(pages_data)
-        self.log(f"Markdown summary: {md_path}")
-
-        # Create symlinks to latest reports for easy access
-        self._create_latest_symlinks(csv_path if self.output_format in ('csv', 'both') else None,
-                                     json_path if self.output_format in ('json', 'both') else None,
-                                     md_path)
+        self._write_reports(pages_data)
 
         self.log("\n" + "=" * 70)
         self.log("AUDIT COMPLETE")
@@ -208,6 +717,88 @@ class ContentAuditor:
 
         return pages_data
 
+    def retry_failed(self):
+        """Refetch only the URLs listed in the requeue file and merge them into the cache."""
+        self.log("Retrying failed URLs...")
+
+        if not self.requeue_file.exists():
+            self.log("Nothing to retry: no requeue file found.")
+            return
+
+        with open(self.requeue_file, 'r', encoding='utf-8') as f:
+            failed = json.load(f)
+
+        self.load_cache()
+        to_fetch = {
+            item['url']: SitemapEntry(url=item['url'], lastmod=item.get('lastmod'),
+                                      content_type=item.get('content_type', 'other'))
+            for item in failed
+        }
+        self.log(f"Refetching {len(to_fetch)} URLs")
+
+        results = self._fetch_entries(to_fetch)
+        recovered = sum(1 for page in results.values() if not page.get('error'))
+        self.log(f"Recovered {recovered} of {len(to_fetch)} pages")
+
+        self.cache.update(results)
+        pages_data = list(self.cache.values())
+        self.save_cache(pages_data)
+        self.clear_journal()
+        self.save_requeue()
+
+        self.webmaster_parser.load_latest_reports()
+        pages_data = self.webmaster_parser.enrich_page_data(pages_data)
+        self._write_reports(pages_data)
+
+        return pages_data
+
+    def merge_shards(self):
+        """Combine shard caches (and requeue files) into the main cache and generate reports."""
+        self.log("Merging shard results...")
+
+        shard_files = sorted(CACHE_FILE.parent.glob(".cache.shard-*-of-*.json"))
+        if not shard_files:
+            self.log("ERROR: No shard caches found. Run --full --shard i/N first.")
+            return
+
+        found = {}
+        for path in shard_files:
+            match = re.match(r'\.cache\.shard-(\d+)-of-(\d+)\.json$', path.name)
+            if match:
+                found.setdefault(int(match.group(2)), {})[int(match.group(1))] = path
+
+        # Use the most recent sharding layout if several exist
+        shard_count = max(found, key=lambda n: max(p.stat().st_mtime for p in found[n].values()))
+        shards = found[shard_count]
+        missing = sorted(set(range(1, shard_count + 1)) - set(shards))
+        if missing:
+            self.log(f"WARNING: missing shards {missing} of {shard_count}; report will be incomplete")
+
+        merged = {}
+        requeue = []
+        for index in sorted(shards):
+            with open(shards[index], 'r', encoding='utf-8') as f:
+                shard_cache = json.load(f)
+            merged.update(shard_cache)
+            self.log(f"  Shard {index}/{shard_count}: {len(shard_cache)} pages")
+
+            requeue_path = REQUEUE_FILE.with_name(f".requeue.shard-{index}-of-{shard_count}.json")
+            if requeue_path.exists():
+                with open(requeue_path, 'r', encoding='utf-8') as f:
+                    requeue.extend(json.load(f))
+
+        pages_data = list(merged.values())
+        self.save_cache(pages_data)
+        self.requeue = requeue
+        self.save_requeue()
+
+        self.webmaster_parser.load_latest_reports()
+        pages_data = self.webmaster_parser.enrich_page_data(pages_data)
+        self._write_reports(pages_data)
+
+        self.log(f"Merged {len(pages_data)} pages from {len(shards)} shards")
+        return pages_data
+
     def update_webmaster_only(self):
         """Update only webmaster data (re-enrich existing cache)."""
         self.log("Updating webmaster data only...")
@@ -230,7 +821,7 @@ class ContentAuditor:
 
         # Generate reports
         self.log("Generating reports...")
-        self.report_generator.generate_all(pages_data)
+        self.report_generator.generate_all(self._report_pages(pages_data))
 
         self.log("Webmaster data update complete")
 
@@ -245,6 +836,18 @@ Examples:
   python scripts/content_audit/main.py --sitemap-only
   python scripts/content_audit/main.py --update-webmaster
   python scripts/content_audit/main.py --full --output json
+  python scripts/content_audit/main.py --full --concurrency 16
+  python scripts/content_audit/main.py --full --concurrency 32 --parse-workers 4
+  python scripts/content_audit/main.py --retry-failed
+  python scripts/content_audit/main.py --full --resume
+  python scripts/content_audit/main.py --full --incremental
+  python scripts/content_audit/main.py --full --adaptive-recrawl
+  python scripts/content_audit/main.py --full --sample 500      # quick health estimate
+  python scripts/content_audit/main.py --full --force-refresh --warc crawl.warc.gz
+  python scripts/content_audit/main.py --replay crawl.warc.gz  # offline, after tuning selectors
+  python scripts/content_audit/main.py --full --order impressions --time-budget 10
+  python scripts/content_audit/main.py --full --shard 1/4   # on each of 4 workers
+  python scripts/content_audit/main.py --merge              # after copying shard caches together
         """
     )
 
@@ -254,20 +857,132 @@ Examples:
                        help='Only fetch and parse sitemap.xml')
     parser.add_argument('--update-webmaster', action='store_true',
                        help='Update webmaster data only (uses cache)')
+    parser.add_argument('--retry-failed', action='store_true',
+                       help='Refetch only URLs that failed in the previous run (uses cache)')
+    parser.add_argument('--shard', metavar='i/N',
+                       help='With --full: crawl only shard i of N (stable URL hash partition)')
+    parser.add_argument('--merge', action='store_true',
+                       help='Merge shard caches into one cache and generate reports')
+    parser.add_argument('--replay', metavar='ARCHIVE',
+                       help='Run the full audit offline from a WARC archive recorded with --warc')
     parser.add_argument('--output', choices=['csv', 'json', 'both'], default='both',
                        help='Output format (default: both)')
     parser.add_argument('--force-refresh', action='store_true',
                        help='Force refresh all pages (ignore cache)')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Fetch only URLs new or changed since the previous sitemap snapshot')
+    parser.add_argument('--max-age-days', type=float, default=7.0,
+                       help='Refresh cached pages without sitemap lastmod after this many days (default: 7)')
+    parser.add_argument('--negative-ttl-days', type=float, default=7.0,
+                       help='Skip pages that returned 404/410 for this many days (default: 7)')
+    parser.add_argument('--adaptive-recrawl', action='store_true',
+                       help='Refetch each page only after its own change interval (learned from its history)')
+    parser.add_argument('--min-recrawl-days', type=float, default=1.0,
+                       help='Shortest recrawl interval for --adaptive-recrawl (default: 1)')
+    parser.add_argument('--max-recrawl-days', type=float, default=30.0,
+                       help='Longest recrawl interval for --adaptive-recrawl (default: 30)')
+    sample_group = parser.add_mutually_exclusive_group()
+    sample_group.add_argument('--sample', type=int, metavar='N',
+                              help='Crawl a stratified sample of N pages and estimate site-wide stats')
+    sample_group.add_argument('--sample-rate', type=float, metavar='P',
+                              help='Like --sample, with a fraction of all pages (e.g. 0.05)')
+    parser.add_argument('--warc', metavar='PATH',
+                       help='With --full: record every fetched response to this .warc.gz archive')
+    parser.add_argument('--order', choices=['sitemap', 'impressions'], default='sitemap',
+                       help='Fetch order: sitemap order or most search impressions first (default: sitemap)')
+    parser.add_argument('--time-budget', type=float, metavar='MINUTES',
+                       help='Stop fetching after this many minutes; unfetched pages reuse cached data')
+    parser.add_argument('--resume', action='store_true',
+                       help='Continue an interrupted --full run from its progress journal')
+    parser.add_argument('--concurrency', type=int, default=8,
+                       help='Number of pages fetched in parallel (default: 8)')
+    parser.add_argument('--per-host-limit', type=int, default=4,
+                       help='Max simultaneous connections per host (default: 4)')
+    parser.add_argument('--adaptive', action='store_true',
+                       help='Adjust concurrency from latency/errors (AIMD); --concurrency is the start value')
+    parser.add_argument('--max-concurrency', type=int, default=32,
+                       help='Upper bound for --adaptive (default: 32)')
+    parser.add_argument('--target-p95', type=float, default=2.0,
+                       help='p95 latency in seconds above which --adaptive backs off (default: 2.0)')
+    parser.add_argument('--parse-workers', type=int, default=0,
+                       help='Parse pages in this many worker processes, overlapping with fetching '
+                            '(default: 0 = parse on the fetch threads)')
+    parser.add_argument('--extractor', choices=PageScraper.EXTRACTORS, default='bs4',
+                       help='HTML extraction backend: bs4 (BeautifulSoup) or lxml '
+                            '(faster single-pass lxml tree, same results) (default: bs4)')
+    parser.add_argument('--boilerplate', action='store_true',
+                       help='Learn header/footer/menu blocks that repeat across pages, drop them from '
+                            'extraction and use the rest of <body> when no content selector matches')
+    parser.add_argument('--fields', metavar='NAMES',
+                       help=f"Optional fields to extract, comma-separated or 'all': {', '.join(EXTRACTORS)}")
+    parser.add_argument('--link-graph', action='store_true',
+                       help='Collect internal links and report internal PageRank, inlinks, click depth '
+                            'from the home page and orphan pages (same as adding outlinks to --fields)')
+    parser.add_argument('--max-retries', type=int, default=2,
+                       help='Retries for timeouts, 429 and 5xx responses (default: 2)')
+    parser.add_argument('--max-page-size', type=float, default=5.0,
+                       help='Abort pages whose body exceeds this many MB (default: 5)')
+    parser.add_argument('--delay', type=float, default=0.5,
+                       help='Minimum seconds between requests to one host (default: 0.5)')
+    parser.add_argument('--ignore-robots', action='store_true',
+                       help='Do not read robots.txt (Disallow / Crawl-delay)')
 
     args = parser.parse_args()
 
     # Validate arguments
-    if not (args.full or args.sitemap_only or args.update_webmaster):
+    if not (args.full or args.sitemap_only or args.update_webmaster or args.retry_failed or args.merge
+            or args.replay):
         parser.print_help()
         sys.exit(1)
+    if args.parse_workers < 0:
+        parser.error("--parse-workers must be 0 or more")
+    if args.sample is not None and args.sample < 1:
+        parser.error("--sample must be at least 1")
+    if args.sample_rate is not None and not 0 < args.sample_rate <= 1:
+        parser.error("--sample-rate must be in (0, 1]")
+    if args.time_budget is not None and args.time_budget <= 0:
+        parser.error("--time-budget must be a positive number of minutes")
+    fields = parse_field_names(args.fields)
+    unknown = [name for name in fields if name not in EXTRACTORS]
+    if unknown:
+        parser.error(f"--fields: unknown {', '.join(unknown)} (available: {', '.join(EXTRACTORS)})")
+    if args.link_graph and 'outlinks' not in fields:
+        fields.append('outlinks')
+
+    shard = None
+    if args.shard:
+        match = re.fullmatch(r'(\d+)/(\d+)', args.shard)
+        if not match or not 1 <= int(match.group(1)) <= int(match.group(2)):
+            parser.error("--shard must look like i/N with 1 <= i <= N, e.g. --shard 2/4")
+        shard = (int(match.group(1)), int(match.group(2)))
 
     # Create auditor
-    auditor = ContentAuditor(output_format=args.output)
+    auditor = ContentAuditor(output_format=args.output,
+                             concurrency=args.concurrency,
+                             per_host_limit=args.per_host_limit,
+                             delay=args.delay,
+                             respect_robots=not args.ignore_robots,
+                             adaptive=args.adaptive,
+                             max_concurrency=args.max_concurrency,
+                             target_p95=args.target_p95,
+                             max_retries=args.max_retries,
+                             max_page_size_mb=args.max_page_size,
+                             shard=shard,
+                             max_age_days=args.max_age_days,
+                             negative_ttl_days=args.negative_ttl_days,
+                             order=args.order,
+                             time_budget=args.time_budget,
+                             adaptive_recrawl=args.adaptive_recrawl,
+                             min_recrawl_days=args.min_recrawl_days,
+                             max_recrawl_days=args.max_recrawl_days,
+                             warc_path=args.warc if args.full else None,
+                             replay_path=args.replay,
+                             sample_size=args.sample,
+                             sample_rate=args.sample_rate,
+                             parse_workers=args.parse_workers,
+                             extractor=args.extractor,
+                             boilerplate=args.boilerplate,
+                             fields=fields)
 
     # Run appropriate mode
     try:
@@ -275,11 +990,18 @@ Examples:
             auditor.run_sitemap_only()
         elif args.update_webmaster:
             auditor.update_webmaster_only()
-        elif args.full:
-            auditor.run_full_audit(force_refresh=args.force_refresh)
+        elif args.retry_failed:
+            auditor.retry_failed()
+        elif args.merge:
+            auditor.merge_shards()
+        elif args.full or args.replay:
+            auditor.run_full_audit(force_refresh=args.force_refresh, resume=args.resume,
+                                   incremental=args.incremental)
 
     except KeyboardInterrupt:
         auditor.log("\n\nAudit interrupted by user")
+        if args.full and auditor.journal_file.exists():
+            auditor.log("Progress saved; continue with --full --resume")
         sys.exit(1)
     except Exception as e:
         auditor.log(f"\n\nERROR: {e}")
@@ -4,12 +4,33 @@ Extracts title, H1, meta description, and content from pages.
 """
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, Tag
 from typing import Dict, Optional, List
 from dataclasses import dataclass, field
+from urllib.parse import urljoin, urlparse
+import socket
+import threading
 import time
 import re
 
+try:
+    from .politeness import parse_retry_after
+    from .freshness import content_hash
+    from .lxml_extractor import extract_fields
+    from .content_selectors import SelectorEngine, has_text
+    from .sampling import url_section
+    from .boilerplate import BoilerplateModel, block_step
+    from .field_extractors import FieldSet, FieldNode
+except ImportError:
+    from politeness import parse_retry_after
+    from freshness import content_hash
+    from lxml_extractor import extract_fields
+    from content_selectors import SelectorEngine, has_text
+    from sampling import url_section
+    from boilerplate import BoilerplateModel, block_step
+    from field_extractors import FieldSet, FieldNode
+
 
 @dataclass
 class PageData:
@@ -22,6 +43,38 @@ class PageData:
     content_text: str = ""
     top_keywords: List[str] = field(default_factory=list)
     error: Optional[str] = None
+    status_code: Optional[int] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False  # True on 304, or when the body hash matches the previous fetch
+    content_hash: Optional[str] = None  # SHA-1 of the raw body
+    final_url: Optional[str] = None  # URL after following redirects
+    redirect_chain: List[str] = field(default_factory=list)  # URLs that redirected, in order
+    canonical: Optional[str] = None  # Absolute <link rel="canonical"> target
+    retry_after: Optional[float] = None  # Seconds requested by a 429/503 Retry-After
+    # Timing of the last attempt, in milliseconds. Connections are pooled, so
+    # connect time is part of TTFB; DNS is timed once per host (dns_times()).
+    ttfb_ms: Optional[float] = None  # Request start to response headers (incl. redirects)
+    total_ms: Optional[float] = None  # Request start to last body byte
+    bytes: Optional[int] = None  # Body bytes received (before content decoding)
+    body: Optional[bytes] = field(default=None, repr=False)  # Raw body, kept only by scrape(parse=False)
+    blocks: List[str] = field(default_factory=list, repr=False)  # DOM block fingerprints for the boilerplate model
+    # Optional fields (--fields); left at their defaults when not enabled
+    meta_robots: Optional[str] = None
+    hreflang: Dict[str, str] = field(default_factory=dict)  # Language -> absolute alternate URL
+    json_ld: List = field(default_factory=list, repr=False)  # Parsed JSON-LD blocks
+    json_ld_invalid: int = 0  # JSON-LD blocks that failed to parse
+    outline: List[str] = field(default_factory=list)  # 'h2: text' / 'h3: text' in document order
+    images: Optional[int] = None
+    images_without_alt: Optional[int] = None
+    outlinks: List[str] = field(default_factory=list, repr=False)  # Internal link targets as site paths
+    # Failure class: 'network', 'http_error', 'non_html', 'too_large', 'parse',
+    # 'robots', 'circuit_open'
+    error_type: Optional[str] = None
+
+
+class ResponseTooLarge(Exception):
+    """Raised when a response body exceeds the configured size limit."""
 
 
 class PageScraper:
@@ -33,99 +86,344 @@ class PageScraper:
         'Accept-Language': 'ru-RU,ru;q=0.9,en;q=0.8'
     }
 
-    def __init__(self, delay: float = 0.5):
+    HTML_CONTENT_TYPES = {'text/html', 'application/xhtml+xml'}
+
+    # Main content candidates, in priority order: the first match with over
+    # 100 characters of text wins (see SelectorEngine)
+    CONTENT_SELECTORS = [
+        # InSales specific
+        '.article-content',
+        '.static-text',
+        '.article_content',
+        '.article_page',
+        '.article-page',
+        '#article',
+        '.blog-article',
+        '.blog_article',
+        # Standard blog selectors
+        'article',
+        '.blog-content',
+        '.post-content',
+        '.entry-content',
+        # E-commerce selectors
+        '.product-description',
+        '.collection-description',
+        '.description',
+        # Generic selectors
+        'main',
+        '.main-content',
+        '#content',
+        '.content',
+        '#main'
+    ]
+
+    # Elements dropped from the content before counting words
+    REMOVED_TAGS = ['script', 'style', 'button', 'form', 'input', 'noscript', 'iframe']
+
+    EXTRACTORS = ('bs4', 'lxml')
+
+    def __init__(self, delay: float = 0.5, max_body_bytes: int = 5 * 1024 * 1024, extractor: str = 'bs4',
+                 fields: List[str] = ()):
+        if extractor not in self.EXTRACTORS:
+            raise ValueError(f"Unknown extractor: {extractor} (expected one of {', '.join(self.EXTRACTORS)})")
         self.delay = delay  # Delay between requests in seconds
+        self.max_body_bytes = max_body_bytes
+        self.extractor = extractor  # 'bs4' (BeautifulSoup) or 'lxml' (fast path, same output)
+        self.selector_engine = SelectorEngine(self.CONTENT_SELECTORS)
+        self.field_set = FieldSet(fields)  # Optional fields collected in one extra pass
+        self.boilerplate: Optional[BoilerplateModel] = None  # Drops learned header/footer/menu blocks
         self.session = requests.Session()
         self.session.headers.update(self.HEADERS)
-
-    def scrape(self, url: str) -> PageData:
-        """Scrape a single page and extract data."""
+        self.recorder = None  # Optional WarcWriter that archives every response
+        self._dns_ms: Dict[str, Optional[float]] = {}
+        self._dns_lock = threading.Lock()
+
+    def configure_pool(self, pool_size: int):
+        """Size the connection pool so concurrent workers can share the session."""
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def scrape(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        previous_hash: Optional[str] = None,
+        parse: bool = True
+    ) -> PageData:
+        """
+        Scrape a single page and extract data.
+
+        If `etag` or `last_modified` from a previous fetch are given, the
+        request is made conditional. A 304 response returns PageData with
+        `not_modified=True` and no extracted fields. The same happens when
+        the body's hash equals `previous_hash`, so unchanged pages are not
+        parsed again even if the server ignores conditional requests.
+
+        The body is streamed: non-HTML responses are rejected from their
+        Content-Type before any body is read, and bodies larger than
+        `max_body_bytes` are aborted. Both cases set `error_type`.
+
+        With `parse=False` the raw body is returned in `page_data.body`
+        instead of being parsed, for a separate parse stage.
+        """
         page_data = PageData(url=url)
 
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        self._dns_time(url)
+        started = time.monotonic()
         try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            response.encoding = 'utf-8'
+            with self.session.get(url, headers=headers, timeout=30, stream=True) as response:
+                page_data.ttfb_ms = self._elapsed_ms(started)
+                page_data.status_code = response.status_code
+                page_data.final_url = response.url
+                page_data.redirect_chain = [r.url for r in response.history]
+                page_data.etag = response.headers.get('ETag')
+                page_data.last_modified = response.headers.get('Last-Modified')
+
+                if response.status_code == 304:
+                    # Servers may omit validators on 304; keep the ones we sent
+                    page_data.etag = page_data.etag or etag
+                    page_data.last_modified = page_data.last_modified or last_modified
+                    page_data.not_modified = True
+                    return page_data
+
+                if response.status_code in (429, 503):
+                    page_data.retry_after = parse_retry_after(response.headers.get('Retry-After'))
+
+                if not response.ok:
+                    self._record(response)
+                response.raise_for_status()
+
+                content_type = response.headers.get('Content-Type', '')
+                if not self._is_html(content_type):
+                    self._record(response)
+                    page_data.error = f"Non-HTML content: {content_type}"
+                    page_data.error_type = 'non_html'
+                    return page_data
+
+                body = self._read_body(response)
+                page_data.total_ms = self._elapsed_ms(started)
+                page_data.bytes = self._wire_bytes(response, body)
+                self._record(response, body)
+
+            page_data.content_hash = content_hash(body)
+            if previous_hash and page_data.content_hash == previous_hash:
+                page_data.not_modified = True
+                return page_data
+
+            if not parse:
+                page_data.body = body
+                return page_data
+
+            self.parse_page(page_data, body)
+
+        except ResponseTooLarge as e:
+            page_data.error = str(e)
+            page_data.error_type = 'too_large'
+        except requests.HTTPError as e:
+            page_data.error = str(e)
+            page_data.error_type = 'http_error'
+        except requests.RequestException as e:
+            page_data.error = str(e)
+            page_data.error_type = 'network'
+        except Exception as e:
+            page_data.error = f"Parse error: {str(e)}"
+            page_data.error_type = 'parse'
+        finally:
+            # 304s, non-HTML and failed requests end without reading a body
+            if page_data.total_ms is None:
+                page_data.total_ms = self._elapsed_ms(started)
 
-            soup = BeautifulSoup(response.text, 'lxml')
+        return page_data
 
-            # Extract title
-            title_tag = soup.find('title')
-            if title_tag:
-                page_data.title = title_tag.get_text(strip=True)
+    @staticmethod
+    def _elapsed_ms(started: float) -> float:
+        """Milliseconds since a time.monotonic() value."""
+        return round((time.monotonic() - started) * 1000, 1)
+
+    def dns_times(self) -> Dict[str, float]:
+        """DNS lookup time (ms) of every host resolved so far."""
+        with self._dns_lock:
+            return {host: ms for host, ms in self._dns_ms.items() if ms is not None}
+
+    def _dns_time(self, url: str) -> Optional[float]:
+        """
+        DNS lookup time for the URL's host, measured once per host.
+        None when the host cannot be resolved or the session does not use
+        the network (e.g. WARC replay).
+        """
+        parsed = urlparse(url)
+        host = parsed.hostname
+        if not host or not isinstance(self.session.get_adapter(url), HTTPAdapter):
+            return None
+        with self._dns_lock:
+            if host in self._dns_ms:
+                return self._dns_ms[host]
+
+        started = time.monotonic()
+        try:
+            socket.getaddrinfo(host, parsed.port or (443 if parsed.scheme == 'https' else 80))
+            dns_ms = self._elapsed_ms(started)
+        except OSError:
+            dns_ms = None
 
-            # Extract H1 (first one)
-            h1_tag = soup.find('h1')
-            if h1_tag:
-                page_data.h1 = h1_tag.get_text(strip=True)
+        with self._dns_lock:
+            return self._dns_ms.setdefault(host, dns_ms)
 
-            # Extract meta description
-            meta_desc = soup.find('meta', attrs={'name': 'description'})
-            if meta_desc and meta_desc.get('content'):
-                page_data.meta_description = meta_desc['content'].strip()
+    @staticmethod
+    def _wire_bytes(response: requests.Response, body: bytes) -> int:
+        """Bytes read from the connection (compressed size), falling back to the body size."""
+        try:
+            return int(response.raw.tell())
+        except (AttributeError, TypeError, ValueError, OSError):
+            return len(body)
+
+    def _record(self, response: requests.Response, body: bytes = b''):
+        """Archive the response if a recorder is attached (error and non-HTML bodies are not kept)."""
+        if self.recorder:
+            self.recorder.write_response(response, body)
+
+    def _is_html(self, content_type: str) -> bool:
+        """Check a Content-Type header; a missing header is given the benefit of the doubt."""
+        if not content_type:
+            return True
+        mime_type = content_type.split(';')[0].strip().lower()
+        return mime_type in self.HTML_CONTENT_TYPES
+
+    def _read_body(self, response: requests.Response) -> bytes:
+        """Read a streamed response body, aborting once it exceeds max_body_bytes."""
+        declared = response.headers.get('Content-Length')
+        if declared and declared.isdigit() and int(declared) > self.max_body_bytes:
+            raise ResponseTooLarge(f"Response too large: {int(declared)} bytes "
+                                   f"(limit {self.max_body_bytes})")
+
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            size += len(chunk)
+            if size > self.max_body_bytes:
+                raise ResponseTooLarge(f"Response too large: over {self.max_body_bytes} bytes")
+            chunks.append(chunk)
+        return b''.join(chunks)
+
+    def parse_page(self, page_data: PageData, body: bytes) -> PageData:
+        """Extract title, H1, meta description, canonical and content from a raw HTML body."""
+        if self.extractor == 'lxml':
+            return self._parse_page_lxml(page_data, body)
+
+        soup = BeautifulSoup(body.decode('utf-8', errors='replace'), 'lxml')
+
+        # Extract title
+        title_tag = soup.find('title')
+        if title_tag:
+            page_data.title = title_tag.get_text(strip=True)
+
+        # Extract H1 (first one)
+        h1_tag = soup.find('h1')
+        if h1_tag:
+            page_data.h1 = h1_tag.get_text(strip=True)
+
+        # Extract meta description
+        meta_desc = soup.find('meta', attrs={'name': 'description'})
+        if meta_desc and meta_desc.get('content'):
+            page_data.meta_description = meta_desc['content'].strip()
+
+        # Extract canonical URL (resolved against the final URL)
+        canonical = soup.find('link', rel='canonical')
+        if canonical and canonical.get('href'):
+            page_data.canonical = urljoin(page_data.final_url or page_data.url, canonical['href'].strip())
+
+        # Optional fields, one pass over the tags they need (before anything is removed)
+        if self.field_set:
+            values = self.field_set.collect(self._field_nodes(soup), page_data.final_url or page_data.url)
+            for name, value in values.items():
+                setattr(page_data, name, value)
+
+        # Drop boilerplate blocks (header, footer, menus) learned for this template
+        template = url_section(page_data.url)
+        if self.boilerplate is not None and soup.body:
+            page_data.blocks, dropped = self.boilerplate.scan(
+                template, self._iter_blocks(soup.body, self.boilerplate.MAX_DEPTH),
+                lambda tag: tag.get_text(separator=' ', strip=True), self._is_content_candidate)
+            for tag in dropped:
+                tag.decompose()
 
-            # Extract main content text
-            content_text = self._extract_content(soup)
-            page_data.content_text = content_text
-            page_data.word_count = self._count_words(content_text)
+        # Extract main content text
+        content_text = self._extract_content(soup, template)
+        page_data.content_text = content_text
+        page_data.word_count = self._count_words(content_text)
 
-        except requests.RequestException as e:
-            page_data.error = str(e)
-        except Exception as e:
-            page_data.error = f"Parse error: {str(e)}"
+        return page_data
 
+    def _parse_page_lxml(self, page_data: PageData, body: bytes) -> PageData:
+        """parse_page() on the lxml fast path: one pass over lxml's tree, no BeautifulSoup."""
+        fields = extract_fields(body, self.selector_engine, self.REMOVED_TAGS, url_section(page_data.url),
+                                self.boilerplate, self.field_set, page_data.final_url or page_data.url)
+        page_data.title = fields.title
+        page_data.h1 = fields.h1
+        page_data.meta_description = fields.meta_description
+        if fields.canonical_href:
+            page_data.canonical = urljoin(page_data.final_url or page_data.url, fields.canonical_href)
+        page_data.content_text = fields.content_text
+        page_data.word_count = self._count_words(fields.content_text)
+        page_data.blocks = fields.blocks
+        for name, value in fields.extra.items():
+            setattr(page_data, name, value)
         return page_data
 
-    def _extract_content(self, soup: BeautifulSoup) -> str:
-        """Extract main text content from page."""
-        # Try to find main content area FIRST before removing anything
-        main_content = None
-
-        # InSales-specific and common content selectors
-        content_selectors = [
-            # InSales specific
-            '.article-content',
-            '.static-text',
-            '.article_content',
-            '.article_page',
-            '.article-page',
-            '#article',
-            '.blog-article',
-            '.blog_article',
-            # Standard blog selectors
-            'article',
-            '.blog-content',
-            '.post-content',
-            '.entry-content',
-            # E-commerce selectors
-            '.product-description',
-            '.collection-description',
-            '.description',
-            # Generic selectors
-            'main',
-            '.main-content',
-            '#content',
-            '.content',
-            '#main'
-        ]
-
-        for selector in content_selectors:
-            if selector.startswith('.') or selector.startswith('#'):
-                main_content = soup.select_one(selector)
-            else:
-                main_content = soup.find(selector)
-            if main_content:
-                # Check if it has substantial content (not just navigation)
-                text = main_content.get_text(separator=' ', strip=True)
-                if len(text) > 100:  # At least 100 characters
+    def _field_nodes(self, soup: BeautifulSoup):
+        """FieldNodes of the tags the enabled optional fields need, in document order."""
+        for tag in soup.find_all(list(self.field_set.tags)):
+            attrs = {name: ' '.join(value) if isinstance(value, list) else value for name, value in tag.attrs.items()}
+            yield FieldNode(tag.name, attrs,
+                            lambda tag=tag: tag.get_text(separator=' ', strip=True),
+                            lambda tag=tag: ''.join(tag.strings))
+
+    @staticmethod
+    def _iter_blocks(parent: Tag, max_depth: int, depth: int = 1, prefix: str = 'body'):
+        """(tag, depth, DOM path) of the tags up to `max_depth` levels below <body>, in document order."""
+        for child in parent.children:
+            if not isinstance(child, Tag):
+                continue
+            path = prefix + '/' + block_step(child.name, child.get('id'), child.get('class') or ())
+            yield child, depth, path
+            if depth < max_depth:
+                yield from PageScraper._iter_blocks(child, max_depth, depth + 1, path)
+
+    def _is_content_candidate(self, tag: Tag) -> bool:
+        """True if a content selector matches the tag (such blocks are never dropped as boilerplate)."""
+        return bool(self.selector_engine.matches(tag.name, tag.get('id'), tag.get('class') or ()))
+
+    def _extract_content(self, soup: BeautifulSoup, template: Optional[str] = None) -> str:
+        """Extract main text content from page; `template` keys the selector memo and boilerplate model."""
+        engine = self.selector_engine
+
+        # Find main content area FIRST before removing unwanted tags: one pass
+        # over the tree collects the first match of every selector
+        def find(start: int, stop: int) -> Dict:
+            candidates = {}
+            for tag in soup.find_all(True):
+                for index in engine.matches(tag.name, tag.get('id'), tag.get('class') or (), start, stop):
+                    candidates.setdefault(index, tag)
+                if len(candidates) == stop - start:
                     break
-                else:
-                    main_content = None
+            return candidates
+
+        # Substantial content (not just navigation): over 100 characters of text
+        main_content = engine.find_main_content(
+            find, lambda tag: has_text(tag.stripped_strings, engine.min_chars), template)
 
         # If we found content, clean it up
         if main_content:
             # Remove unwanted elements within the content
-            for tag in main_content.find_all(['script', 'style', 'button', 'form', 'input', 'noscript', 'iframe']):
+            for tag in main_content.find_all(self.REMOVED_TAGS):
                 tag.decompose()
 
             text = main_content.get_text(separator=' ', strip=True)
@@ -133,6 +431,14 @@ class PageScraper:
             text = re.sub(r'\s+', ' ', text)
             return text
 
+        # No selector matched: with a trained boilerplate model, what is left of <body> is the content
+        if self.boilerplate is not None and template and soup.body and self.boilerplate.is_trained(template):
+            for tag in soup.body.find_all(self.REMOVED_TAGS):
+                tag.decompose()
+            text = soup.body.get_text(separator=' ', strip=True)
+            if len(text) > engine.min_chars:
+                return re.sub(r'\s+', ' ', text)
+
         return ""
 
     def _count_words(self, text: str) -> int:
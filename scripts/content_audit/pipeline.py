@@ -0,0 +1,129 @@
+"""
+Parse Pipeline for [YOUR-DOMAIN] Content Audit
+Moves HTML parsing and keyword extraction off the fetch threads into worker processes.
+
+Fetching is I/O-bound and runs on threads; HTML parsing and keyword
+counting are CPU-bound and hold the GIL. In pipeline mode the fetch stage
+returns raw bodies, and a process pool parses them so throughput scales with
+cores. Both hand-offs are bounded, so a slow stage holds back the fast one
+instead of buffering the whole site in memory.
+"""
+
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Iterable, Iterator, List, Optional
+
+try:
+    from .page_scraper import PageScraper, PageData
+    from .keyword_extractor import KeywordExtractor
+    from .boilerplate import BoilerplateModel
+except ImportError:
+    from page_scraper import PageScraper, PageData
+    from keyword_extractor import KeywordExtractor
+    from boilerplate import BoilerplateModel
+
+
+# Per-process parser state, created once by the pool initializer
+_scraper: Optional[PageScraper] = None
+_extractor: Optional[KeywordExtractor] = None
+
+_DONE = object()  # End-of-stream marker on the fetch queue
+
+
+def _init_worker(extractor: str = 'bs4', boilerplate: Optional[Dict] = None, fields: List[str] = ()) -> None:
+    """Create the parser and keyword extractor of a worker process."""
+    global _scraper, _extractor
+    _scraper = PageScraper(extractor=extractor, fields=fields)
+    if boilerplate is not None:
+        _scraper.boilerplate = BoilerplateModel.from_dict(boilerplate)
+    _extractor = KeywordExtractor()
+
+
+def parse_and_extract(page_data: PageData, body: bytes) -> PageData:
+    """
+    Parse a raw body and extract keywords (runs in a worker process).
+
+    The content text is dropped after keyword extraction: it is not part of
+    the page record and would only be pickled back to the main process.
+    """
+    try:
+        _scraper.parse_page(page_data, body)
+        if page_data.content_text:
+            page_data.top_keywords = _extractor.extract(page_data.content_text, top_n=10)
+    except Exception as e:
+        page_data.error = f"Parse error: {str(e)}"
+        page_data.error_type = 'parse'
+    page_data.content_text = ""
+    return page_data
+
+
+class ParsePipeline:
+    """
+    Second crawl stage: parses fetched bodies in a process pool.
+
+    `queue_size` bounds fetched-but-unparsed pages waiting in memory;
+    at most `2 * workers` parse jobs are in flight. `extractor` is the
+    PageScraper backend and `fields` the optional fields the workers
+    parse with. Workers get a snapshot of
+    the `boilerplate` model taken when the run starts; the blocks they
+    report are learned by the main process.
+    """
+
+    def __init__(self, workers: int = 4, queue_size: int = 64, extractor: str = 'bs4',
+                 boilerplate: Optional[BoilerplateModel] = None, fields: List[str] = ()):
+        self.workers = max(1, workers)
+        self.extractor = extractor
+        self.fields = list(fields)
+        self.boilerplate = boilerplate
+        self.queue_size = max(1, queue_size)
+        self.max_pending = self.workers * 2
+
+    def run(self, fetched: Iterable[PageData]) -> Iterator[PageData]:
+        """
+        Consume PageData with raw `body` from the fetch stage on a background
+        thread and yield parsed PageData in completion order. Pages without a
+        body (errors, 304s, unchanged hashes) are passed through as they are.
+        """
+        fetch_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+
+        def produce():
+            try:
+                for page_data in fetched:
+                    fetch_queue.put(page_data)
+            except BaseException as e:
+                fetch_queue.put(e)
+            finally:
+                fetch_queue.put(_DONE)
+
+        # spawn: the parent has live fetch threads, which fork() does not copy safely
+        context = multiprocessing.get_context('spawn')
+        snapshot = self.boilerplate.to_dict() if self.boilerplate is not None else None
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                 initializer=_init_worker, initargs=(self.extractor, snapshot, self.fields)) as pool:
+            threading.Thread(target=produce, name='fetch-stage', daemon=True).start()
+            pending = set()
+            fetching = True
+
+            while fetching or pending:
+                # Take fetched pages while there is room in the parse stage
+                while fetching and len(pending) < self.max_pending:
+                    try:
+                        item = fetch_queue.get_nowait() if pending else fetch_queue.get()
+                    except queue.Empty:
+                        break
+                    if item is _DONE:
+                        fetching = False
+                    elif isinstance(item, BaseException):
+                        raise item
+                    elif item.body is None:
+                        yield item
+                    else:
+                        body, item.body = item.body, None
+                        pending.add(pool.submit(parse_and_extract, item, body))
+
+                if pending:
+                    done, pending = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
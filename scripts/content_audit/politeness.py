@@ -0,0 +1,188 @@
+"""
+Politeness Scheduler for [YOUR-DOMAIN] Content Audit
+Per-host request pacing: robots.txt rules, Crawl-delay, Retry-After and a token bucket.
+"""
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class TokenBucket:
+    """Thread-safe token bucket that hands out request slots at a fixed rate."""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate  # Tokens per second (0 = unlimited)
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take one token and return how many seconds the caller must wait for it.
+        Tokens may go negative, so concurrent callers queue up behind each other.
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+class HostPolicy:
+    """Crawl rules and pacing state for a single host."""
+
+    def __init__(self, robots: Optional[RobotFileParser], bucket: TokenBucket, crawl_delay: Optional[float]):
+        self.robots = robots
+        self.bucket = bucket
+        self.crawl_delay = crawl_delay
+        self.blocked_until = 0.0  # Monotonic time set by Retry-After
+
+
+class PolitenessScheduler:
+    """
+    Decides whether and when a URL may be fetched.
+
+    Each host gets its own robots.txt rules and token bucket. The bucket rate
+    is the stricter of `default_delay` and the site's Crawl-delay; a 429/503
+    Retry-After pauses the whole host.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        user_agent: str,
+        default_delay: float = 0.5,
+        burst: int = 1,
+        respect_robots: bool = True,
+        max_defer: float = 300.0,
+        throttle: bool = True
+    ):
+        self.session = session
+        self.user_agent = user_agent
+        self.default_delay = default_delay
+        self.burst = burst
+        self.respect_robots = respect_robots
+        self.max_defer = max_defer  # Cap so one Retry-After cannot stall the audit for hours
+        self.throttle = throttle  # False: apply robots.txt rules only, no pacing (offline replay)
+        self.recorder = None  # Optional WarcWriter that archives robots.txt responses
+        self._hosts: Dict[str, HostPolicy] = {}
+        self._host_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.stats = {'disallowed': 0, 'deferrals': 0}
+
+    def _policy(self, url: str) -> HostPolicy:
+        """Return the policy for the URL's host, reading robots.txt on first use."""
+        parsed = urlparse(url)
+        host = parsed.netloc
+
+        with self._lock:
+            if host in self._hosts:
+                return self._hosts[host]
+            host_lock = self._host_locks.setdefault(host, threading.Lock())
+
+        # Only one thread per host fetches robots.txt; other hosts are not blocked
+        with host_lock:
+            if host in self._hosts:
+                return self._hosts[host]
+
+            robots = None
+            crawl_delay = None
+            if self.respect_robots:
+                robots = self._fetch_robots(f"{parsed.scheme}://{host}/robots.txt")
+                crawl_delay = robots.crawl_delay(self.user_agent)
+                request_rate = robots.request_rate(self.user_agent)
+                if request_rate and request_rate.requests:
+                    rate_delay = request_rate.seconds / request_rate.requests
+                    crawl_delay = max(crawl_delay or 0, rate_delay)
+
+            delay = max(self.default_delay, float(crawl_delay or 0)) if self.throttle else 0
+            bucket = TokenBucket(rate=1.0 / delay if delay > 0 else 0, capacity=self.burst)
+            policy = HostPolicy(robots, bucket, float(crawl_delay) if crawl_delay else None)
+
+            with self._lock:
+                self._hosts[host] = policy
+            return policy
+
+    def _fetch_robots(self, robots_url: str) -> RobotFileParser:
+        """Fetch and parse robots.txt using the same conventions as urllib.robotparser."""
+        robots = RobotFileParser(robots_url)
+        try:
+            response = self.session.get(robots_url, timeout=10)
+            if self.recorder:
+                self.recorder.write_response(response, response.content)
+            if response.status_code in (401, 403):
+                robots.disallow_all = True
+            elif 400 <= response.status_code < 500:
+                robots.allow_all = True
+            elif response.ok:
+                robots.parse(response.text.splitlines())
+            else:
+                # Server errors: be permissive rather than skipping the whole site
+                robots.allow_all = True
+        except requests.RequestException:
+            robots.allow_all = True
+        return robots
+
+    def allowed(self, url: str) -> bool:
+        """Check robots.txt Disallow rules for the URL."""
+        policy = self._policy(url)
+        if policy.robots is None or policy.robots.can_fetch(self.user_agent, url):
+            return True
+        with self._lock:
+            self.stats['disallowed'] += 1
+        return False
+
+    def wait_turn(self, url: str, deadline: Optional[float] = None) -> bool:
+        """
+        Block until the URL's host may receive another request.
+        Returns False without waiting if the turn would come after `deadline`
+        (a time.monotonic() value).
+        """
+        policy = self._policy(url)
+        wait = policy.bucket.reserve()
+        now = time.monotonic()
+        wait = max(wait, policy.blocked_until - now)
+        if deadline is not None and now + max(wait, 0.0) >= deadline:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    def defer(self, url: str, seconds: float) -> None:
+        """Pause all requests to the URL's host for `seconds` (Retry-After)."""
+        policy = self._policy(url)
+        seconds = min(seconds, self.max_defer)
+        with self._lock:
+            policy.blocked_until = max(policy.blocked_until, time.monotonic() + seconds)
+            self.stats['deferrals'] += 1
+
+    def crawl_delays(self) -> Dict[str, Optional[float]]:
+        """Return the robots.txt Crawl-delay discovered for each host."""
+        return {host: policy.crawl_delay for host, policy in self._hosts.items()}
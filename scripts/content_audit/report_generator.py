@@ -12,8 +12,16 @@ from datetime import datetime
 
 try:
     from .gap_analyzer import GapAnalyzer
+    from .duplicate_analyzer import DuplicateAnalyzer, FIELDS as DUPLICATE_FIELDS
+    from .sampling import estimate_site_stats
+    from .adaptive_concurrency import percentile
+    from .link_graph import LINK_GRAPH_COLUMNS, link_graph_summary
 except ImportError:
     from gap_analyzer import GapAnalyzer
+    from duplicate_analyzer import DuplicateAnalyzer, FIELDS as DUPLICATE_FIELDS
+    from sampling import estimate_site_stats
+    from adaptive_concurrency import percentile
+    from link_graph import LINK_GRAPH_COLUMNS, link_graph_summary
 
 
 class ReportGenerator:
@@ -24,6 +32,14 @@ class ReportGenerator:
         self.output_dir.mkdir(parents=True, exist_ok=True)
         # Generate date suffix for all reports
         self.date_suffix = datetime.now().strftime('%Y-%m-%d')
+        # SamplePlan of a --sample run; adds site-wide estimates to the summaries
+        self.sample_plan = None
+        # Columns of the optional fields enabled with --fields
+        self.extra_columns: List[str] = []
+        # ISO time the crawl started: latency covers only rows fetched since then (None: all rows)
+        self.run_started: Optional[str] = None
+        # DNS lookup time per host, measured once per host by the scraper
+        self.dns_ms_by_host: Dict[str, float] = {}
 
     def generate_csv(self, pages: List[Dict], filename: str = None) -> Path:
         """Generate CSV report from page data."""
@@ -52,8 +68,17 @@ class ReportGenerator:
             'total_clicks',
             'total_impressions',
             'status',
-            'error'
-        ]
+            'error',
+            'error_type',
+            'status_code',
+            'canonical',
+            'aliases',
+            'ttfb_ms',
+            'total_ms',
+            'bytes'
+        ] + self.extra_columns
+        if any('pagerank' in page for page in pages):
+            columns += LINK_GRAPH_COLUMNS
 
         with open(output_path, 'w', newline='', encoding='utf-8-sig') as f:
             writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
@@ -63,6 +88,8 @@ class ReportGenerator:
                 # Format keywords as comma-separated string
                 if 'top_keywords' in page and isinstance(page['top_keywords'], list):
                     page['top_keywords'] = ', '.join(page['top_keywords'])
+                if isinstance(page.get('aliases'), list):
+                    page['aliases'] = ', '.join(page['aliases'])
 
                 # Calculate total clicks and impressions
                 yandex_clicks = page.get('yandex_clicks') or 0
@@ -81,25 +108,40 @@ class ReportGenerator:
                 else:
                     page['status'] = 'no_content'
 
-                writer.writerow(page)
+                # Optional field values are lists/dicts; flatten them in the row only, JSON keeps them
+                row = dict(page)
+                for column in self.extra_columns:
+                    value = row.get(column)
+                    if isinstance(value, dict):
+                        row[column] = '; '.join(f"{k}={v}" for k, v in value.items())
+                    elif isinstance(value, list):
+                        row[column] = ' | '.join(str(v) for v in value)
+
+                writer.writerow(row)
 
         return output_path
 
-    def generate_json(self, pages: List[Dict], filename: str = None) -> Path:
-        """Generate JSON report with full data and summary statistics."""
+    def generate_json(self, pages: List[Dict], filename: str = None,
+                      summary: Optional[Dict[str, Any]] = None) -> Path:
+        """
+        Generate JSON report with full data and summary statistics.
+        Pass `summary` (from calculate_summary) to reuse one already computed.
+        """
         if filename is None:
             filename = f"site-content-audit-{self.date_suffix}.json"
         output_path = self.output_dir / filename
 
         # Calculate summary statistics
-        summary = self._calculate_summary(pages)
+        if summary is None:
+            summary = self.calculate_summary(pages)
 
-        # Prepare output structure
+        # Prepare output structure; outlink lists stay in the cache (the link graph columns summarize them)
         report = {
             "generated": datetime.now().isoformat(),
             "total_pages": len(pages),
             "summary": summary,
-            "pages": pages
+            "pages": [{k: v for k, v in page.items() if k != 'outlinks'} if 'outlinks' in page else page
+                      for page in pages]
         }
 
         with open(output_path, 'w', encoding='utf-8') as f:
@@ -107,7 +149,7 @@ class ReportGenerator:
 
         return output_path
 
-    def _calculate_summary(self, pages: List[Dict]) -> Dict[str, Any]:
+    def calculate_summary(self, pages: List[Dict]) -> Dict[str, Any]:
         """Calculate summary statistics from page data."""
         summary = {
             "by_type": {},
@@ -192,13 +234,73 @@ class ReportGenerator:
         ]
         summary['content_gaps'] = low_content_pages[:20]  # Top 20 pages needing content
 
+        if self.sample_plan:
+            summary['sample_estimates'] = estimate_site_stats(pages, self.sample_plan)
+
+        summary['latency'] = self._calculate_latency(pages)
+        summary['duplicates'] = DuplicateAnalyzer().generate_analysis(pages)
+
+        if any('pagerank' in page for page in pages):
+            summary['link_graph'] = link_graph_summary(pages)
+
         return summary
 
+    def _calculate_latency(self, pages: List[Dict], slowest: int = 10) -> Dict[str, Any]:
+        """
+        Fetch time percentiles (ms) per content type, DNS time per host and the slowest pages.
+
+        Only rows downloaded in full by this run count: rows reused from the
+        cache and 304 / unchanged-hash revalidations are left out.
+        """
+        def stats(timed: List[Dict]) -> Dict[str, Any]:
+            totals = [p['total_ms'] for p in timed]
+            ttfbs = [p['ttfb_ms'] for p in timed if p.get('ttfb_ms') is not None]
+            sizes = [p['bytes'] for p in timed if p.get('bytes') is not None]
+            return {
+                'pages': len(timed),
+                'p50_ms': percentile(totals, 50),
+                'p95_ms': percentile(totals, 95),
+                'p99_ms': percentile(totals, 99),
+                'ttfb_p50_ms': percentile(ttfbs, 50),
+                'ttfb_p95_ms': percentile(ttfbs, 95),
+                'avg_bytes': round(sum(sizes) / len(sizes)) if sizes else 0
+            }
+
+        timed = [
+            p for p in pages
+            if p.get('total_ms') is not None and not p.get('revalidated')
+            and (self.run_started is None or (p.get('fetched_at') or '') >= self.run_started)
+        ]
+        if not timed:
+            return {}
+
+        by_type: Dict[str, List[Dict]] = {}
+        for page in timed:
+            by_type.setdefault(page.get('content_type', 'unknown'), []).append(page)
+
+        return {
+            'overall': stats(timed),
+            'by_type': {content_type: stats(group) for content_type, group in sorted(by_type.items())},
+            'dns_ms_by_host': dict(self.dns_ms_by_host),
+            'slowest_pages': [
+                {
+                    'url': p['url'],
+                    'content_type': p.get('content_type'),
+                    'status_code': p.get('status_code'),
+                    'ttfb_ms': p.get('ttfb_ms'),
+                    'total_ms': p['total_ms'],
+                    'bytes': p.get('bytes')
+                }
+                for p in sorted(timed, key=lambda p: p['total_ms'], reverse=True)[:slowest]
+            ]
+        }
+
     def generate_markdown_summary(
         self,
         pages: List[Dict],
         filename: str = None,
-        include_gap_analysis: bool = True
+        include_gap_analysis: bool = True,
+        summary: Optional[Dict[str, Any]] = None
     ) -> Path:
         """
         Generate a markdown summary highlighting content gaps and opportunities.
@@ -207,12 +309,14 @@ class ReportGenerator:
             pages: List of page data dicts
             filename: Output filename (default: content-gaps-YYYY-MM-DD.md)
             include_gap_analysis: Whether to run SEO gap analysis
+            summary: Summary from calculate_summary, if already computed
         """
         if filename is None:
             filename = f"content-gaps-{self.date_suffix}.md"
         output_path = self.output_dir / filename
 
-        summary = self._calculate_summary(pages)
+        if summary is None:
+            summary = self.calculate_summary(pages)
 
         # Run gap analysis if requested
         gap_analysis = None
@@ -239,6 +343,9 @@ class ReportGenerator:
                 f.write(f"- **GSC Queries Analyzed:** {gap_analysis['query_counts']['gsc']}\n")
             f.write(f"- **Pages with Errors:** {summary['pages_with_errors']}\n\n")
 
+            if 'sample_estimates' in summary:
+                self._write_sample_estimates_section(f, summary['sample_estimates'])
+
             # By content type
             f.write("## Content by Type\n\n")
             for content_type, count in sorted(summary['by_type'].items(), key=lambda x: x[1], reverse=True):
@@ -266,6 +373,11 @@ class ReportGenerator:
                 self._write_ctr_optimization_section(f, gap_analysis.get('ctr_candidates', []))
                 self._write_cannibalization_section(f, gap_analysis.get('cannibalization', []))
 
+            self._write_duplicates_section(f, summary['duplicates'])
+            self._write_aliases_section(f, pages)
+            self._write_latency_section(f, summary.get('latency'))
+            self._write_link_graph_section(f, summary.get('link_graph'))
+
             # Content gaps (low word count)
             if summary['content_gaps']:
                 f.write("## Low Content Pages (<300 words)\n\n")
@@ -356,12 +468,170 @@ class ReportGenerator:
 
             f.write("\n")
 
+    def _write_duplicates_section(self, f, duplicates: Dict) -> None:
+        """Write duplicate and near-duplicate titles, meta descriptions and H1s to markdown file."""
+        if not duplicates['pages_with_duplicates']:
+            return
+
+        f.write("---\n\n")
+        f.write("## 🪞 Duplicate Titles, Descriptions and H1\n\n")
+        f.write(f"{duplicates['pages_with_duplicates']} pages share a title, meta description or H1 with another page "
+                f"(near = same words ignoring the brand suffix, punctuation and word order):\n\n")
+        f.write("| Field | Exact groups | Pages | Near groups | Pages | Brand affixes |\n")
+        f.write("|-------|--------------|-------|-------------|-------|---------------|\n")
+        for field_name, label in DUPLICATE_FIELDS.items():
+            stats = duplicates['fields'][field_name]
+            affixes = stats['brand_affixes']['prefixes'] + stats['brand_affixes']['suffixes']
+            f.write(f"| {label} | {stats['exact_groups']} | {stats['exact_pages']} | {stats['near_groups']} | "
+                    f"{stats['near_pages']} | {', '.join(f'`{a}`' for a in affixes) or '-'} |\n")
+        f.write("\n")
+
+        for field_name, label in DUPLICATE_FIELDS.items():
+            groups = duplicates['fields'][field_name]['exact'] + duplicates['fields'][field_name]['near']
+            if not groups:
+                continue
+            f.write(f"### Duplicate {label}\n\n")
+            f.write("| # | Type | Text | Pages |\n")
+            f.write("|---|------|------|-------|\n")
+            for i, group in enumerate(groups[:15], 1):
+                text = group['text'][:80] + "..." if len(group['text']) > 80 else group['text']
+                urls = [page['url'] for page in group['pages'][:5]]
+                if len(group['pages']) > 5:
+                    urls.append(f"*...and {len(group['pages']) - 5} more*")
+                f.write(f"| {i} | {group['kind']} | {text.replace('|', '/')} | {'<br>'.join(urls)} |\n")
+            if len(groups) > 15:
+                f.write(f"\n*...and {len(groups) - 15} more groups*\n")
+            f.write("\n")
+
+        f.write("**Action:** Сделать title, meta description и H1 уникальными для каждой страницы\n\n")
+
+    def _write_sample_estimates_section(self, f, estimates: Dict) -> None:
+        """Write site-wide estimates of a sampling run to markdown file."""
+        f.write("## 📊 Site-wide Estimates (sample)\n\n")
+        f.write(f"Based on a stratified sample of {estimates['sample_size']:,} of "
+                f"{estimates['population']:,} pages ({estimates['strata']} strata by content type and "
+                f"URL section), {estimates['confidence']:.0%} confidence intervals:\n\n")
+        if estimates.get('not_fetched'):
+            f.write(f"{estimates['not_fetched']:,} sampled pages were not fetched (time budget, robots.txt, "
+                    f"open circuit) and are left out of the estimates.\n\n")
+        f.write("| Metric | Estimate | 95% CI | Pages site-wide |\n")
+        f.write("|--------|----------|--------|-----------------|\n")
+
+        if 'avg_word_count' in estimates:
+            words = estimates['avg_word_count']
+            f.write(f"| Average word count | {words['estimate']:,} | {words['low']:,} – {words['high']:,} | – |\n")
+        for key, label in (('low_content', 'Low content (<300 words)'), ('error', 'Error rate')):
+            if f'{key}_share' not in estimates:
+                continue
+            share = estimates[f'{key}_share']
+            pages = estimates[f'{key}_pages']
+            f.write(f"| {label} | {share['estimate']:.1%} | {share['low']:.1%} – {share['high']:.1%} | "
+                    f"~{pages['estimate']:,} ({pages['low']:,} – {pages['high']:,}) |\n")
+        f.write("\n")
+
+    def _write_latency_section(self, f, latency: Optional[Dict]) -> None:
+        """Write fetch latency percentiles and the slowest pages to markdown file."""
+        if not latency:
+            return
+
+        f.write("---\n\n")
+        f.write("## ⏱️ Page Fetch Latency\n\n")
+        f.write("Measured by the crawler (request start to last byte; TTFB includes connect time):\n\n")
+        f.write("| Type | Pages | p50 | p95 | p99 | TTFB p50 | TTFB p95 | Avg. size |\n")
+        f.write("|------|-------|-----|-----|-----|----------|----------|-----------|\n")
+        rows = list(latency['by_type'].items()) + [('**all**', latency['overall'])]
+        for content_type, s in rows:
+            f.write(f"| {content_type} | {s['pages']} | {s['p50_ms']:.0f} ms | {s['p95_ms']:.0f} ms | "
+                    f"{s['p99_ms']:.0f} ms | {s['ttfb_p50_ms']:.0f} ms | {s['ttfb_p95_ms']:.0f} ms | "
+                    f"{s['avg_bytes'] / 1024:.0f} KB |\n")
+        f.write("\n")
+
+        for host, dns_ms in latency['dns_ms_by_host'].items():
+            f.write(f"- DNS lookup for {host}: {dns_ms:.0f} ms\n")
+        if latency['dns_ms_by_host']:
+            f.write("\n")
+
+        f.write("### Slowest Pages\n\n")
+        f.write("| # | Page | Status | TTFB | Total | Size |\n")
+        f.write("|---|------|--------|------|-------|------|\n")
+        for i, page in enumerate(latency['slowest_pages'], 1):
+            ttfb = f"{page['ttfb_ms']:.0f} ms" if page.get('ttfb_ms') is not None else '-'
+            size = f"{page['bytes'] / 1024:.0f} KB" if page.get('bytes') is not None else '-'
+            f.write(f"| {i} | {page['url']} | {page.get('status_code') or '-'} | {ttfb} | "
+                    f"{page['total_ms']:.0f} ms | {size} |\n")
+        f.write("\n")
+
+    def _write_link_graph_section(self, f, link_graph: Optional[Dict]) -> None:
+        """Write internal PageRank, click depth distribution and orphan pages to markdown file."""
+        if not link_graph:
+            return
+
+        f.write("---\n\n")
+        f.write("## 🔗 Internal Link Graph\n\n")
+        f.write(f"{link_graph['pages']:,} pages with {link_graph['links']:,} internal links pointing to them "
+                f"(PageRank 1.0 = average page).\n\n")
+        if link_graph['pages_without_link_data']:
+            f.write(f"*{link_graph['pages_without_link_data']} pages have no link data (cached before "
+                    f"--link-graph); re-crawl them with --force-refresh for complete results*\n\n")
+
+        f.write("### Click Depth from Home Page\n\n")
+        if not link_graph['has_home']:
+            f.write("*No link data for the home page; click depth is unknown*\n\n")
+        else:
+            f.write("| Clicks | Pages |\n")
+            f.write("|--------|-------|\n")
+            for depth, count in link_graph['click_depth'].items():
+                f.write(f"| {depth} | {count:,} |\n")
+            f.write("\n")
+
+        f.write("### Top Pages by Internal PageRank\n\n")
+        f.write("| # | Page | PageRank | Inlinks | Clicks |\n")
+        f.write("|---|------|----------|---------|--------|\n")
+        for i, page in enumerate(link_graph['top_pagerank'], 1):
+            depth = page['click_depth'] if page['click_depth'] is not None else '-'
+            f.write(f"| {i} | {page['url']} | {page['pagerank']:.2f} | {page['inlinks']:,} | {depth} |\n")
+        f.write("\n")
+
+        orphans = link_graph['orphans']
+        if orphans:
+            f.write(f"### Orphan Pages ({len(orphans)})\n\n")
+            f.write("Sitemap pages that no other audited page links to:\n\n")
+            for url in orphans[:30]:
+                f.write(f"- {url}\n")
+            if len(orphans) > 30:
+                f.write(f"\n*...and {len(orphans) - 30} more orphan pages*\n")
+            f.write("\n**Action:** Добавить внутренние ссылки на страницы-сироты (из категорий, статей, перелинковки)\n\n")
+
+    def _write_aliases_section(self, f, pages: List[Dict]) -> None:
+        """Write URL aliases (redirects / canonicals collapsed into one page) to markdown file."""
+        alias_pages = [p for p in pages if p.get('aliases')]
+        if not alias_pages:
+            return
+
+        f.write("---\n\n")
+        f.write("## 🔀 URL Aliases\n\n")
+        f.write("Sitemap URLs that redirect or canonicalize to the same page (fetched and reported once):\n\n")
+        f.write("| # | Canonical Page | Aliases |\n")
+        f.write("|---|----------------|---------|\n")
+
+        for i, page in enumerate(alias_pages[:30], 1):
+            aliases = page['aliases']
+            if isinstance(aliases, str):
+                aliases = [a.strip() for a in aliases.split(',')]
+            f.write(f"| {i} | {page['url']} | {'<br>'.join(aliases)} |\n")
+
+        if len(alias_pages) > 30:
+            f.write(f"\n*...and {len(alias_pages) - 30} more pages with aliases*\n")
+        f.write("\n**Action:** Убрать алиасы из sitemap, оставить только канонические URL\n\n")
+
     def generate_all(self, pages: List[Dict]) -> Dict[str, Path]:
-        """Generate all report formats."""
+        """Generate all report formats, computing the summary once for JSON and markdown."""
+        csv_path = self.generate_csv(pages)  # Also normalizes list fields the summary reads
+        summary = self.calculate_summary(pages)
         return {
-            'csv': self.generate_csv(pages),
-            'json': self.generate_json(pages),
-            'markdown': self.generate_markdown_summary(pages)
+            'csv': csv_path,
+            'json': self.generate_json(pages, summary=summary),
+            'markdown': self.generate_markdown_summary(pages, summary=summary)
         }
 
 
@@ -0,0 +1,186 @@
+"""
+Retry Policy and Circuit Breaker for [YOUR-DOMAIN] Content Audit
+Bounded retries with jittered exponential backoff, and per-host failure isolation.
+"""
+
+import random
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+try:
+    from .page_scraper import PageData
+except ImportError:
+    from page_scraper import PageData
+
+
+class RetryPolicy:
+    """Decides which failures are worth retrying and how long to wait."""
+
+    # HTTP statuses that usually clear up on their own
+    TRANSIENT_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 1.0, max_delay: float = 30.0):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def is_transient(self, page_data: PageData) -> bool:
+        """
+        True for timeouts, connection errors and retryable HTTP statuses, and
+        for pages skipped by an open circuit breaker (their host was failing,
+        so they are worth another try later, e.g. with --retry-failed).
+        """
+        if page_data.error_type in ('network', 'circuit_open'):
+            return True
+        if page_data.error_type == 'http_error':
+            return page_data.status_code in self.TRANSIENT_STATUSES
+        return False
+
+    def backoff(self, attempt: int) -> float:
+        """Seconds to sleep after the given failed attempt (1-based), with full jitter."""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+
+class HostCircuit:
+    """Failure state of a single host."""
+
+    def __init__(self):
+        self.failures = 0  # Consecutive failures while closed
+        self.open_until = 0.0  # Monotonic time; 0 = closed
+        self.trips = 0  # Consecutive openings without a success in between
+        self.down_since = 0.0  # Monotonic time of the first of those openings
+        self.skipped = 0  # Requests failed fast after giving up on the host
+        self.probing = False  # A half-open probe request is in flight
+        self.probe_owner: Optional[int] = None  # Thread that was granted the probe
+        self.last_failure: Optional[Tuple[str, Optional[int]]] = None  # (error, status) of the last failure
+
+
+class CircuitBreaker:
+    """
+    Pauses a host after repeated failures.
+
+    closed -> open after `failure_threshold` consecutive failures. While open,
+    requests to the host wait for the cooldown, then a single probe request
+    is let through (half-open). A successful probe closes the circuit; a
+    failed one opens it again. The cooldown is `cooldown` seconds for the
+    first `max_trips` openings in a row, then doubles up to `max_cooldown`.
+
+    A host that has been failing for `give_up_after` seconds is considered
+    down: requests fail fast instead of waiting (and are requeued), but
+    probes continue after every cooldown, so a host that comes back is
+    crawled again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 60.0, max_trips: int = 3,
+                 max_cooldown: float = 600.0, give_up_after: float = 900.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_trips = max_trips
+        self.max_cooldown = max(cooldown, max_cooldown)
+        self.give_up_after = give_up_after
+        self._circuits: Dict[str, HostCircuit] = {}
+        self._cond = threading.Condition()
+
+    def _circuit(self, url: str) -> HostCircuit:
+        host = urlparse(url).netloc
+        if host not in self._circuits:
+            self._circuits[host] = HostCircuit()
+        return self._circuits[host]
+
+    def acquire(self, url: str, deadline: Optional[float] = None) -> bool:
+        """
+        Wait until a request to the URL's host is allowed.
+        Returns False if the host is considered down and the request should be
+        skipped, or if the circuit is still open at `deadline` (time.monotonic()).
+        """
+        with self._cond:
+            while True:
+                circuit = self._circuit(url)
+                if not circuit.open_until:
+                    return True
+
+                now = time.monotonic()
+                if now >= circuit.open_until and not circuit.probing:
+                    circuit.probing = True
+                    circuit.probe_owner = threading.get_ident()
+                    return True
+                if now - circuit.down_since >= self.give_up_after:
+                    circuit.skipped += 1
+                    return False
+
+                if deadline is not None and now >= deadline:
+                    return False
+
+                wait = circuit.open_until - now if now < circuit.open_until else None
+                if deadline is not None:
+                    wait = min(wait, deadline - now) if wait is not None else deadline - now
+                self._cond.wait(timeout=wait)
+
+    def record(self, url: str, failed: bool, page_data: Optional[PageData] = None) -> None:
+        """Record the outcome of a request allowed by acquire() (with its PageData, if failed)."""
+        with self._cond:
+            circuit = self._circuit(url)
+            half_open = circuit.probing
+            circuit.probing = False
+            circuit.probe_owner = None
+
+            if failed and page_data is not None:
+                circuit.last_failure = (page_data.error, page_data.status_code)
+            if not failed:
+                circuit.failures = 0
+                circuit.trips = 0
+                circuit.open_until = 0.0
+            else:
+                circuit.failures += 1
+                if half_open or circuit.failures >= self.failure_threshold:
+                    now = time.monotonic()
+                    if not circuit.trips:
+                        circuit.down_since = now
+                    circuit.trips += 1
+                    circuit.open_until = now + self.cooldown_after(circuit.trips)
+                    circuit.failures = 0
+
+            self._cond.notify_all()
+
+    def release(self, url: str) -> None:
+        """
+        Give back a request allowed by acquire() that was not sent (no record()
+        follows). If it was the half-open probe, another request may probe.
+        """
+        with self._cond:
+            circuit = self._circuit(url)
+            if circuit.probing and circuit.probe_owner == threading.get_ident():
+                circuit.probing = False
+                circuit.probe_owner = None
+                self._cond.notify_all()
+
+    def cooldown_after(self, trips: int) -> float:
+        """Cooldown after the given number of openings in a row."""
+        return min(self.max_cooldown, self.cooldown * 2 ** max(0, trips - self.max_trips))
+
+    def skipped(self, url: str) -> PageData:
+        """
+        PageData for a URL skipped because its host's circuit is open. Keeps
+        the host's last real error (message and status) so reports show why.
+        """
+        with self._cond:
+            last = self._circuit(url).last_failure
+        if last is None:
+            return PageData(url=url, error="Circuit open: host is failing repeatedly", error_type='circuit_open')
+        error, status_code = last
+        return PageData(url=url, status_code=status_code,
+                        error=f"Circuit open: host is failing repeatedly (last error: {error})",
+                        error_type='circuit_open')
+
+    def open_hosts(self) -> Dict[str, int]:
+        """Return hosts whose circuit has opened, with the number of consecutive trips."""
+        with self._cond:
+            return {host: c.trips for host, c in self._circuits.items() if c.trips}
+
+    def skipped_by_host(self) -> Dict[str, int]:
+        """Return hosts that were given up on, with the number of requests skipped."""
+        with self._cond:
+            return {host: c.skipped for host, c in self._circuits.items() if c.skipped}
@@ -0,0 +1,209 @@
+"""
+Sampling Audit for [YOUR-DOMAIN] Content Audit
+Stratified URL sampling and site-wide estimates with confidence intervals.
+
+Strata are (content_type, URL section) pairs, so a small sample still covers
+every part of the catalog. Pages are picked by a stable URL hash, so repeated
+sample runs look at the same pages and can reuse the cache.
+"""
+
+import hashlib
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+try:
+    from .sitemap_parser import SitemapEntry
+except ImportError:
+    from sitemap_parser import SitemapEntry
+
+
+Z_95 = 1.96  # Normal quantile for 95% confidence intervals
+LOW_CONTENT_WORDS = 300  # Same threshold as the "Low Content Pages" report section
+NOT_FETCHED = ('time_budget', 'robots', 'circuit_open')  # error_type of sampled pages that were never fetched
+
+
+def url_section(url: str) -> str:
+    """Site section of a URL: up to two path segments above the page slug (e.g. 'blogs/blog')."""
+    segments = [s for s in urlparse(url).path.split('/') if s]
+    return '/'.join(segments[:-1][:2]) or '/'
+
+
+def stratum_of(url: str, content_type: str) -> str:
+    """Stratum key of a page."""
+    return f"{content_type}:{url_section(url)}"
+
+
+@dataclass
+class SamplePlan:
+    """Which entries were sampled, and how many pages each stratum has in the full sitemap."""
+    entries: List[SitemapEntry] = field(default_factory=list)
+    population: Dict[str, int] = field(default_factory=dict)
+    allocation: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def population_size(self) -> int:
+        return sum(self.population.values())
+
+
+def allocate(population: Dict[str, int], size: int) -> Dict[str, int]:
+    """
+    Split a sample size across strata in proportion to their size; the
+    total never exceeds `size`.
+
+    Every stratum gets at least one page when there are no more strata than
+    `size`; otherwise only the `size` largest strata get one page each.
+    Rounding leftovers go to the strata with the largest fractional share.
+    """
+    total = sum(population.values())
+    size = min(size, total)
+    quotas = {key: size * count / total for key, count in population.items()}
+    if len(quotas) > size:
+        largest = sorted(quotas, key=lambda k: (-quotas[k], k))[:size]
+        return {key: 1 if key in largest else 0 for key in quotas}
+
+    allocation = {key: min(population[key], max(1, int(quota))) for key, quota in quotas.items()}
+    # The one-page minimum can overshoot: take pages back from the most over-allocated strata
+    excess = sum(allocation.values()) - size
+    for key in sorted(quotas, key=lambda k: allocation[k] - quotas[k], reverse=True):
+        if excess <= 0:
+            break
+        taken = min(excess, allocation[key] - 1)
+        allocation[key] -= taken
+        excess -= taken
+
+    remaining = size - sum(allocation.values())
+    for key in sorted(quotas, key=lambda k: quotas[k] - int(quotas[k]), reverse=True):
+        if remaining <= 0:
+            break
+        if allocation[key] < population[key]:
+            allocation[key] += 1
+            remaining -= 1
+    return allocation
+
+
+def stratified_sample(entries: List[SitemapEntry], size: Optional[int] = None,
+                      rate: Optional[float] = None) -> SamplePlan:
+    """
+    Draw a stratified sample of `size` entries (or `rate` of all entries).
+
+    Within each stratum the entries with the lowest MD5 URL hash are taken,
+    which is random with respect to content but identical on every run.
+    """
+    strata: Dict[str, List[SitemapEntry]] = {}
+    for entry in entries:
+        strata.setdefault(stratum_of(entry.url, entry.content_type), []).append(entry)
+
+    population = {key: len(members) for key, members in strata.items()}
+    if size is None:
+        size = math.ceil((rate or 0) * len(entries))
+    allocation = allocate(population, size) if entries else {}
+
+    picked = set()
+    for key, members in strata.items():
+        ranked = sorted(members, key=lambda e: hashlib.md5(e.url.encode('utf-8')).hexdigest())
+        picked.update(e.url for e in ranked[:allocation[key]])
+
+    return SamplePlan(
+        entries=[entry for entry in entries if entry.url in picked],
+        population=population,
+        allocation=allocation
+    )
+
+
+def _stratified_mean(groups: Dict[str, List[float]], population: Dict[str, int]) -> Optional[Dict]:
+    """
+    Stratified estimate of a mean with a 95% confidence interval.
+
+    mean = sum(W_h * ybar_h), var = sum(W_h^2 * (1 - n_h/N_h) * s_h^2 / n_h),
+    with W_h = N_h / N over the strata that have observations. A stratum
+    with a single observation contributes no variance.
+    """
+    groups = {key: values for key, values in groups.items() if values}
+    total = sum(population[key] for key in groups)
+    if not total:
+        return None
+
+    mean = 0.0
+    variance = 0.0
+    for key, values in groups.items():
+        n, N = len(values), population[key]
+        weight = N / total
+        group_mean = sum(values) / n
+        mean += weight * group_mean
+        if n > 1:
+            s2 = sum((v - group_mean) ** 2 for v in values) / (n - 1)
+            variance += weight ** 2 * max(0.0, 1 - n / N) * s2 / n
+
+    margin = Z_95 * math.sqrt(variance)
+    return {'estimate': mean, 'low': mean - margin, 'high': mean + margin}
+
+
+def estimate_site_stats(pages: List[Dict], plan: SamplePlan) -> Dict:
+    """
+    Extrapolate sampled pages to the whole sitemap.
+
+    Returns the average word count (of pages without errors), the share of
+    low-content pages and the error rate, each with a 95% confidence interval,
+    plus the implied number of pages site-wide. Pages that were never
+    fetched (time budget, robots.txt, open circuit) say nothing about the
+    site and are left out of the sample.
+    """
+    words: Dict[str, List[float]] = {}
+    low_content: Dict[str, List[float]] = {}
+    errors: Dict[str, List[float]] = {}
+    not_fetched = 0
+
+    for page in pages:
+        key = stratum_of(page['url'], page.get('content_type', 'other'))
+        if key not in plan.population:
+            continue
+        if page.get('error_type') in NOT_FETCHED:
+            not_fetched += 1
+            continue
+        word_count = page.get('word_count') or 0
+        errors.setdefault(key, []).append(1.0 if page.get('error') else 0.0)
+        low_content.setdefault(key, []).append(1.0 if 0 < word_count < LOW_CONTENT_WORDS else 0.0)
+        if not page.get('error'):
+            words.setdefault(key, []).append(float(word_count))
+
+    population_size = plan.population_size
+    stats = {
+        'population': population_size,
+        'sample_size': sum(len(values) for values in errors.values()),
+        'not_fetched': not_fetched,
+        'strata': len(plan.population),
+        'confidence': 0.95
+    }
+
+    avg_words = _stratified_mean(words, plan.population)
+    if avg_words:
+        stats['avg_word_count'] = {k: round(max(0.0, v)) for k, v in avg_words.items()}
+
+    for name, groups in (('low_content', low_content), ('error', errors)):
+        share = _stratified_mean(groups, plan.population)
+        if not share:
+            continue
+        share = {k: min(1.0, max(0.0, v)) for k, v in share.items()}
+        stats[f'{name}_share'] = {k: round(v, 4) for k, v in share.items()}
+        stats[f'{name}_pages'] = {k: round(v * population_size) for k, v in share.items()}
+
+    return stats
+
+
+if __name__ == "__main__":
+    # Quick test with a synthetic sitemap
+    test_entries = (
+        [SitemapEntry(f"https://shop.example/blogs/blog/post-{i}", None, 'blog') for i in range(900)] +
+        [SitemapEntry(f"https://shop.example/collection/c-{i}", None, 'collection') for i in range(100)]
+    )
+    test_plan = stratified_sample(test_entries, size=50)
+    print(f"Sampled {len(test_plan.entries)} of {test_plan.population_size}: {test_plan.allocation}")
+
+    test_pages = [
+        {'url': e.url, 'content_type': e.content_type, 'word_count': (i * 37) % 900,
+         'error': 'HTTP 500' if i % 10 == 0 else None}
+        for i, e in enumerate(test_plan.entries)
+    ]
+    print(estimate_site_stats(test_pages, test_plan))
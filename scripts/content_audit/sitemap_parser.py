@@ -1,12 +1,19 @@
 """
 Sitemap Parser for SEO Content Audit
 Fetches and parses sitemap.xml, filters for blog and collection pages.
+
+Sitemap indexes are followed recursively, child sitemaps are fetched in
+parallel, gzipped sitemaps (.xml.gz) are decompressed transparently, and URLs
+listed in several children are kept once.
 """
 
+import hashlib
+import zlib
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from xml.etree import ElementTree
-from typing import List, Dict, Optional
-from dataclasses import dataclass
+from typing import List, Dict, Optional, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime
 
 try:
@@ -25,6 +32,15 @@ class SitemapEntry:
     content_type: str  # 'blog', 'collection', 'product', 'other'
 
 
+@dataclass
+class SitemapDiff:
+    """Difference between two sitemap snapshots (sets of URLs)."""
+    new: set = field(default_factory=set)
+    changed: set = field(default_factory=set)
+    removed: set = field(default_factory=set)
+    unchanged: set = field(default_factory=set)
+
+
 class SitemapParser:
     """Parses sitemap.xml and filters relevant pages."""
 
@@ -32,25 +48,108 @@ class SitemapParser:
         'sm': 'http://www.sitemaps.org/schemas/sitemap/0.9'
     }
 
-    def __init__(self, sitemap_url: str = None):
+    # Protocol limit for one uncompressed sitemap; also caps gzip decompression
+    MAX_SITEMAP_BYTES = 50 * 1024 * 1024
+    # Sitemap indexes may not nest per the protocol, but some sites do; stop after this many levels
+    MAX_INDEX_DEPTH = 3
+
+    def __init__(self, sitemap_url: str = None, workers: int = 4):
         self.sitemap_url = sitemap_url or SITEMAP_URL
         if not self.sitemap_url:
             raise ValueError("sitemap_url required. Set in config.py or pass as argument.")
+        self.workers = max(1, workers)  # Child sitemaps fetched in parallel
         self.entries: List[SitemapEntry] = []
+        self.sitemaps: List[str] = []  # URL-set sitemaps read by the last fetch_and_parse()
+        self.duplicates = 0  # URLs listed more than once across them
+        self.session = requests.Session()
+        self.recorder = None  # Optional WarcWriter that archives the sitemap responses
 
-    def fetch_sitemap(self) -> str:
-        """Fetch sitemap XML content from URL."""
-        response = requests.get(
-            self.sitemap_url,
+    def fetch_sitemap(self, url: str = None) -> bytes:
+        """Fetch sitemap XML content from URL (the configured sitemap by default), gunzipped if needed."""
+        response = self.session.get(
+            url or self.sitemap_url,
             headers={'User-Agent': USER_AGENT},
             timeout=30
         )
         response.raise_for_status()
-        return response.text
+        if self.recorder:
+            self.recorder.write_response(response, response.content)
+        return self._decompress(response.content)
+
+    def _decompress(self, content: bytes) -> bytes:
+        """
+        Gunzip a .xml.gz body. Detected by the gzip magic bytes rather than the
+        URL or Content-Type, since servers label these files inconsistently
+        (and requests already decodes Content-Encoding: gzip).
+        """
+        if not content.startswith(b'\x1f\x8b'):
+            return content
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        xml_content = decompressor.decompress(content, self.MAX_SITEMAP_BYTES)
+        if decompressor.unconsumed_tail:
+            raise ValueError(f"Sitemap exceeds {self.MAX_SITEMAP_BYTES // (1024 * 1024)} MB uncompressed")
+        return xml_content
+
+    def _read(self, url: str) -> Tuple[List[str], List[SitemapEntry]]:
+        """Fetch one sitemap document: (child sitemap URLs if it is an index, URL entries)."""
+        root = ElementTree.fromstring(self.fetch_sitemap(url))
+        if root.tag.endswith('sitemapindex'):
+            children = [
+                loc.text.strip()
+                for loc in root.findall('sm:sitemap/sm:loc', self.NAMESPACES)
+                if loc.text and loc.text.strip()
+            ]
+            return children, []
+        return [], self._entries(root)
+
+    def fetch_all(self) -> List[SitemapEntry]:
+        """
+        Fetch the sitemap and, if it is a sitemap index, all child sitemaps
+        (level by level, each level in parallel). Entries keep index order;
+        a URL listed in several sitemaps is kept at its first occurrence.
+
+        A failed child raises like a failed root: a partial URL list would
+        make incremental runs evict the missing pages from the cache.
+        """
+        entries: List[SitemapEntry] = []
+        seen_urls = set()
+        seen_sitemaps = {self.sitemap_url}
+        self.sitemaps = []
+        self.duplicates = 0
+
+        level = [self.sitemap_url]
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for depth in range(self.MAX_INDEX_DEPTH + 1):
+                next_level = []
+                for url, (children, url_entries) in zip(level, executor.map(self._read, level)):
+                    if url_entries or not children:
+                        self.sitemaps.append(url)
+                    for entry in url_entries:
+                        if entry.url in seen_urls:
+                            self.duplicates += 1
+                            continue
+                        seen_urls.add(entry.url)
+                        entries.append(entry)
+                    for child in children:
+                        if child not in seen_sitemaps:
+                            seen_sitemaps.add(child)
+                            next_level.append(child)
+                if not next_level:
+                    break
+                if depth == self.MAX_INDEX_DEPTH:
+                    raise ValueError(f"Sitemap indexes nested deeper than {self.MAX_INDEX_DEPTH} levels")
+                level = next_level
+
+        self.entries = entries
+        return entries
+
+    def parse(self, xml_content) -> List[SitemapEntry]:
+        """Parse a sitemap XML document (str or bytes) and extract URL entries."""
+        self.entries = self._entries(ElementTree.fromstring(xml_content))
+        return self.entries
 
-    def parse(self, xml_content: str) -> List[SitemapEntry]:
-        """Parse sitemap XML and extract URL entries."""
-        root = ElementTree.fromstring(xml_content)
+    def _entries(self, root: ElementTree.Element) -> List[SitemapEntry]:
+        """URL entries of a parsed <urlset>."""
         entries = []
 
         # Find all <url> elements
@@ -69,7 +168,6 @@ class SitemapParser:
                     content_type=content_type
                 ))
 
-        self.entries = entries
         return entries
 
     def _determine_content_type(self, url: str) -> str:
@@ -90,14 +188,49 @@ class SitemapParser:
             if entry.content_type in ('blog', 'collection')
         ]
 
+    @staticmethod
+    def shard_of(url: str, shard_count: int) -> int:
+        """Stable 1-based shard number for a URL (same on every machine and run)."""
+        digest = hashlib.md5(url.encode('utf-8')).digest()
+        return int.from_bytes(digest[:8], 'big') % shard_count + 1
+
+    def filter_shard(self, entries: List[SitemapEntry], shard_index: int, shard_count: int) -> List[SitemapEntry]:
+        """Return the entries belonging to shard `shard_index` of `shard_count`."""
+        return [
+            entry for entry in entries
+            if self.shard_of(entry.url, shard_count) == shard_index
+        ]
+
+    @staticmethod
+    def snapshot(entries: List[SitemapEntry]) -> Dict[str, Optional[str]]:
+        """Reduce entries to a {url: lastmod} snapshot for later diffing."""
+        return {entry.url: entry.lastmod for entry in entries}
+
+    @staticmethod
+    def diff(previous: Dict[str, Optional[str]], entries: List[SitemapEntry]) -> SitemapDiff:
+        """Compare current entries against a previous snapshot."""
+        result = SitemapDiff()
+        current_urls = set()
+
+        for entry in entries:
+            current_urls.add(entry.url)
+            if entry.url not in previous:
+                result.new.add(entry.url)
+            elif previous[entry.url] != entry.lastmod:
+                result.changed.add(entry.url)
+            else:
+                result.unchanged.add(entry.url)
+
+        result.removed = set(previous) - current_urls
+        return result
+
     def get_all(self) -> List[SitemapEntry]:
         """Return all parsed entries."""
         return self.entries
 
     def fetch_and_parse(self, filter_content: bool = True) -> List[SitemapEntry]:
-        """Convenience method to fetch and parse in one call."""
-        xml_content = self.fetch_sitemap()
-        self.parse(xml_content)
+        """Convenience method to fetch and parse in one call (following sitemap indexes)."""
+        self.fetch_all()
 
         if filter_content:
             return self.filter_blog_and_collections()
@@ -112,7 +245,9 @@ class SitemapParser:
         return {
             'total': len(self.entries),
             'by_type': type_counts,
-            'blog_and_collection': len(self.filter_blog_and_collections())
+            'blog_and_collection': len(self.filter_blog_and_collections()),
+            'sitemaps': len(self.sitemaps),
+            'duplicates': self.duplicates
         }
 
 
@@ -130,3 +265,4 @@ if __name__ == "__main__":
     for content_type, count in stats['by_type'].items():
         print(f"    - {content_type}: {count}")
     print(f"  Blog + Collection: {stats['blog_and_collection']}")
+    print(f"  Sitemaps read: {stats['sitemaps']} ({stats['duplicates']} duplicate URLs dropped)")
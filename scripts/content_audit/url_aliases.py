@@ -0,0 +1,118 @@
+"""
+URL Alias Detection for [YOUR-DOMAIN] Content Audit
+Groups sitemap URLs that redirect or canonicalize to the same page.
+
+Example: /collection/x, /collections/x and /collections/x/ all end up at
+/collections/x, so they are fetched once and reported as one row.
+"""
+
+from typing import Dict, Iterable, List, Optional, Set
+
+# Webmaster sources whose *_clicks / *_impressions / *_ctr / *_position are merged across aliases
+SEARCH_SOURCES = ('yandex', 'gsc')
+
+
+def canonical_key(page: Dict, known_urls: Set[str]) -> str:
+    """
+    Return the URL a page is really served as.
+
+    A redirect target always wins over the requested URL. A rel=canonical
+    target is only trusted when it points at a URL we know about (a sitemap
+    entry or another page's redirect target), so a theme that canonicalizes
+    every page to the home page does not collapse the whole site.
+    """
+    key = page.get('final_url') or page['url']
+    canonical = page.get('canonical')
+    if canonical and canonical != key and canonical in known_urls:
+        key = canonical
+    return key
+
+
+def group_aliases(pages: Iterable[Dict]) -> Dict[str, List[str]]:
+    """
+    Group page URLs by canonical key.
+
+    Returns:
+        Mapping of representative URL -> list of alias URLs (only groups
+        with at least one alias). The representative is the URL equal to
+        the key if it is among the pages, otherwise the first in input order.
+    """
+    pages = list(pages)
+    known_urls = {p['url'] for p in pages} | {p['final_url'] for p in pages if p.get('final_url')}
+
+    groups: Dict[str, List[str]] = {}
+    for page in pages:
+        groups.setdefault(canonical_key(page, known_urls), []).append(page['url'])
+
+    aliases = {}
+    for key, urls in groups.items():
+        if len(urls) < 2:
+            continue
+        representative = key if key in urls else urls[0]
+        aliases[representative] = [url for url in urls if url != representative]
+    return aliases
+
+
+def alias_map(pages: Iterable[Dict]) -> Dict[str, str]:
+    """Return alias URL -> representative URL."""
+    return {
+        alias: representative
+        for representative, alias_urls in group_aliases(pages).items()
+        for alias in alias_urls
+    }
+
+
+def merge_search_metrics(rows: List[Dict]) -> Dict:
+    """
+    Combine Yandex / GSC metrics of rows that are the same page: clicks and
+    impressions are summed, position is averaged weighted by impressions and
+    CTR (%) recomputed. Sources without data on any row are left out.
+    """
+    merged = {}
+    for source in SEARCH_SOURCES:
+        with_data = [r for r in rows if r.get(f'{source}_impressions') is not None
+                     or r.get(f'{source}_clicks') is not None]
+        if not with_data:
+            continue
+        clicks = sum(r.get(f'{source}_clicks') or 0 for r in with_data)
+        impressions = sum(r.get(f'{source}_impressions') or 0 for r in with_data)
+        ranked = [(r[f'{source}_position'], r.get(f'{source}_impressions') or 0)
+                  for r in with_data if r.get(f'{source}_position') is not None]
+        weight = sum(shown for _, shown in ranked)
+        if weight:
+            position = round(sum(pos * shown for pos, shown in ranked) / weight, 1)
+        else:
+            position = ranked[0][0] if ranked else None
+        merged.update({
+            f'{source}_clicks': clicks,
+            f'{source}_impressions': impressions,
+            f'{source}_ctr': round(clicks / impressions * 100, 2) if impressions else None,
+            f'{source}_position': position,
+        })
+    return merged
+
+
+def collapse_aliases(pages: List[Dict], aliases: Optional[Dict[str, List[str]]] = None) -> List[Dict]:
+    """
+    Drop alias rows and list them on their representative's row.
+
+    Order is preserved; each representative row is copied and gets an
+    `aliases` list. Search traffic of the aliases is added to the row
+    (see merge_search_metrics).
+    """
+    if aliases is None:
+        aliases = group_aliases(pages)
+    alias_urls = {url for urls in aliases.values() for url in urls}
+    alias_rows = {page['url']: page for page in pages if page['url'] in alias_urls}
+
+    collapsed = []
+    for page in pages:
+        if page['url'] in alias_urls:
+            continue
+        if page['url'] in aliases:
+            rows = [page] + [alias_rows[url] for url in aliases[page['url']] if url in alias_rows]
+            page = dict(page)
+            page['aliases'] = aliases[page['url']]
+            page.update(merge_search_metrics(rows))
+        collapsed.append(page)
+    return collapsed
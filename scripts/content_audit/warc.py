@@ -0,0 +1,233 @@
+"""
+WARC Archive for [YOUR-DOMAIN] Content Audit
+Records raw HTTP responses to a .warc.gz file and serves them back offline.
+
+Each record is a separate gzip member (the usual .warc.gz layout), so an
+archive cut off by a crash is still readable up to its last full record.
+"""
+
+import base64
+import gzip
+import hashlib
+import io
+import threading
+import uuid
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+# Bodies are stored decoded, so transfer-level headers no longer describe them
+DROPPED_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length'}
+
+
+@dataclass
+class WarcRecord:
+    """A recorded HTTP response."""
+    url: str
+    status_code: int
+    reason: str = ''
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: bytes = b''
+    date: Optional[str] = None
+
+
+class WarcWriter:
+    """Appends response records to a gzipped WARC file; safe to share between fetch threads."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.records = 0
+        self._file = open(self.path, 'wb')
+        self._lock = threading.Lock()
+        self._write_record('warcinfo', None, 'application/warc-fields',
+                           b"software: [YOUR-PROJECT]-content-audit\r\nformat: WARC File Format 1.0\r\n")
+
+    def write_response(self, response: requests.Response, body: bytes = b'') -> None:
+        """Record a response (and any redirects that led to it) with its decoded body."""
+        for hop in response.history:
+            self._write_http(hop.url, hop.status_code, hop.reason, hop.headers, b'')
+        self._write_http(response.url, response.status_code, response.reason, response.headers, body)
+
+    def _write_http(self, url: str, status_code: int, reason: Optional[str], headers, body: bytes) -> None:
+        """Write one application/http response record."""
+        lines = [f"HTTP/1.1 {status_code} {reason or ''}".rstrip()]
+        lines += [f"{name}: {value}" for name, value in headers.items() if name.lower() not in DROPPED_HEADERS]
+        lines.append(f"Content-Length: {len(body)}")
+        block = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1', errors='replace') + body
+
+        digest = base64.b32encode(hashlib.sha1(body).digest()).decode('ascii')
+        self._write_record('response', url, 'application/http; msgtype=response', block,
+                           {'WARC-Payload-Digest': f"sha1:{digest}"})
+
+    def _write_record(self, record_type: str, url: Optional[str], content_type: str,
+                      block: bytes, extra: Dict[str, str] = None) -> None:
+        """Compress one WARC record into its own gzip member and append it."""
+        headers = {
+            'WARC-Type': record_type,
+            'WARC-Record-ID': f"<urn:uuid:{uuid.uuid4()}>",
+            'WARC-Date': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        }
+        if url:
+            headers['WARC-Target-URI'] = url
+        headers.update(extra or {})
+        headers['Content-Type'] = content_type
+        headers['Content-Length'] = str(len(block))
+
+        head = 'WARC/1.0\r\n' + ''.join(f"{name}: {value}\r\n" for name, value in headers.items()) + '\r\n'
+        member = gzip.compress(head.encode('utf-8') + block + b'\r\n\r\n')
+
+        with self._lock:
+            self._file.write(member)
+            self._file.flush()
+            if record_type == 'response':
+                self.records += 1
+
+    def close(self) -> None:
+        """Close the archive file."""
+        with self._lock:
+            self._file.close()
+
+
+def _read_member(f) -> Optional[bytes]:
+    """Decompress the gzip member at the current file position (None at EOF or on a cut-off member)."""
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    chunks = []
+    while not decompressor.eof:
+        data = f.read(64 * 1024)
+        if not data:
+            return None
+        chunks.append(decompressor.decompress(data))
+    # Step back over the bytes that belong to the next member
+    f.seek(-len(decompressor.unused_data), io.SEEK_CUR)
+    return b''.join(chunks)
+
+
+def _parse_record(raw: bytes) -> Optional[WarcRecord]:
+    """Parse a WARC response record; other record types return None."""
+    head, _, rest = raw.partition(b'\r\n\r\n')
+    warc_headers = {}
+    for line in head.decode('utf-8', errors='replace').split('\r\n')[1:]:
+        name, _, value = line.partition(':')
+        warc_headers[name.strip().lower()] = value.strip()
+    if warc_headers.get('warc-type') != 'response':
+        return None
+
+    block = rest[:int(warc_headers.get('content-length', len(rest)))]
+    http_head, _, body = block.partition(b'\r\n\r\n')
+    status_line, *header_lines = http_head.decode('latin-1').split('\r\n')
+    parts = status_line.split(' ', 2)
+
+    headers = {}
+    for line in header_lines:
+        name, _, value = line.partition(':')
+        headers[name.strip()] = value.strip()
+
+    return WarcRecord(
+        url=warc_headers.get('warc-target-uri', ''),
+        status_code=int(parts[1]),
+        reason=parts[2] if len(parts) > 2 else '',
+        headers=headers,
+        body=body,
+        date=warc_headers.get('warc-date')
+    )
+
+
+def iter_records(path: Path) -> Iterator[Tuple[int, WarcRecord]]:
+    """Yield (file offset, record) for every response record in a .warc.gz file."""
+    with open(path, 'rb') as f:
+        while True:
+            offset = f.tell()
+            raw = _read_member(f)
+            if raw is None:
+                break
+            record = _parse_record(raw)
+            if record is not None:
+                yield offset, record
+
+
+class WarcArchive:
+    """
+    Random access to the responses in a .warc.gz file by URL.
+
+    Only record offsets are kept in memory; a record is decompressed again
+    when it is requested. If a URL was recorded several times, the last
+    record wins.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._offsets: Dict[str, int] = {record.url: offset for offset, record in iter_records(self.path)}
+        self._file = open(self.path, 'rb')
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._offsets
+
+    def get(self, url: str) -> Optional[WarcRecord]:
+        """Return the recorded response for a URL (None if it was not archived)."""
+        offset = self._offsets.get(url)
+        if offset is None:
+            return None
+        with self._lock:
+            self._file.seek(offset)
+            raw = _read_member(self._file)
+        return _parse_record(raw)
+
+
+class WarcReplayAdapter(BaseAdapter):
+    """
+    requests transport that answers from a WarcArchive instead of the network.
+
+    Mounted on a Session, it lets the normal fetch code (sitemap, robots.txt,
+    PageScraper.scrape with its redirect, streaming and error handling) run
+    unchanged against the archive. URLs missing from the archive fail like a
+    connection error.
+    """
+
+    def __init__(self, archive: WarcArchive):
+        super().__init__()
+        self.archive = archive
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        record = self.archive.get(request.url)
+        if record is None:
+            raise requests.ConnectionError(f"Not in WARC archive: {request.url}", request=request)
+
+        response = requests.Response()
+        response.status_code = record.status_code
+        response.reason = record.reason
+        response.headers = CaseInsensitiveDict(record.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = io.BytesIO(record.body)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
+
+
+if __name__ == "__main__":
+    # Quick test: summarize an archive
+    import sys
+
+    archive_path = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("research/content-audit/crawl.warc.gz")
+    statuses = {}
+    for _, record in iter_records(archive_path):
+        statuses[record.status_code] = statuses.get(record.status_code, 0) + 1
+    print(f"{archive_path}: {sum(statuses.values())} responses")
+    for status, count in sorted(statuses.items()):
+        print(f"  HTTP {status}: {count}")
@@ -10,6 +10,7 @@ import io
 from typing import Dict, Optional, List
 from pathlib import Path
 from dataclasses import dataclass
+from urllib.parse import urlparse
 
 
 @dataclass
@@ -32,6 +33,7 @@ class WebmasterDataParser:
     def __init__(self, webmasters_dir: str = "research/webmasters"):
         self.webmasters_dir = Path(webmasters_dir)
         self.url_metrics: Dict[str, WebmasterMetrics] = {}
+        self._path_index: Dict[str, WebmasterMetrics] = {}
 
     def parse_yandex_csv(self, csv_path: Path) -> Dict[str, WebmasterMetrics]:
         """
@@ -215,6 +217,12 @@ class WebmasterDataParser:
                     url_metrics[url] = gsc_metrics
 
         self.url_metrics = url_metrics
+
+        # Path lookup table; the first URL with a given path wins, as in a linear scan
+        self._path_index = {}
+        for metric_url, metrics in url_metrics.items():
+            self._path_index.setdefault(urlparse(metric_url).path, metrics)
+
         return url_metrics
 
     def get_metrics_for_url(self, url: str) -> Optional[WebmasterMetrics]:
@@ -224,15 +232,14 @@ class WebmasterDataParser:
             return self.url_metrics[url]
 
         # Try without protocol/domain (path only)
-        from urllib.parse import urlparse
-        parsed = urlparse(url)
-        path = parsed.path
-
-        for metric_url, metrics in self.url_metrics.items():
-            if urlparse(metric_url).path == path:
-                return metrics
-
-        return None
+        return self._path_index.get(urlparse(url).path)
+
+    def get_total_impressions(self, url: str) -> int:
+        """Yandex + GSC impressions for a URL (0 if it has no metrics)."""
+        metrics = self.get_metrics_for_url(url)
+        if not metrics:
+            return 0
+        return (metrics.yandex_impressions or 0) + (metrics.gsc_impressions or 0)
 
     def enrich_page_data(self, pages: List[Dict]) -> List[Dict]:
         """